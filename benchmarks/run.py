@@ -0,0 +1,206 @@
+"""
+RIS benchmark suite.
+
+    python -m rip.benchmarks.run [--quick] [--mode generic|specialized|both]
+                                 [--output results.json] [--compare baseline.json]
+
+For every message shape of benchmarks.schemas it measures serialize / deserialize /
+to_dict / from_dict / RTranscoder throughput, per-message latency percentiles and the
+memory retained by decoded messages; schema loading and code generation are timed too.
+Results are written as JSON so that two runs (e.g. two commits) can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import yaml
+
+from rip.core import RISParser, RTranscoder
+from rip.benchmarks.schemas import build_schema, sample_value
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CONFIGS = {
+    # messages: distinct sample messages per shape; list_size: items of the large lists
+    "full": dict(messages=200, list_size=1000, depth=8, width=200, enums=50, enum_values=300,
+                 min_time=0.5, repeat=3, latency_samples=2000),
+    "quick": dict(messages=50, list_size=200, depth=4, width=50, enums=10, enum_values=50,
+                  min_time=0.1, repeat=1, latency_samples=300),
+}
+
+
+def throughput(operation, items, min_time: float, repeat: int) -> float:
+    """Best operations/s over repeat runs of at least min_time seconds each."""
+    best = 0.0
+    for _ in range(repeat):
+        count, start = 0, time.perf_counter()
+        while True:
+            for item in items:
+                operation(item)
+            count += len(items)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, count / elapsed)
+    return best
+
+
+def latency(operation, items, samples: int) -> dict:
+    timings = []
+    clock = time.perf_counter_ns
+    for index in range(samples):
+        item = items[index % len(items)]
+        start = clock()
+        operation(item)
+        timings.append(clock() - start)
+    timings.sort()
+    pick = lambda q: timings[min(len(timings) - 1, int(q * len(timings)))]
+    return {"p50": pick(0.50), "p90": pick(0.90), "p99": pick(0.99), "max": timings[-1]}
+
+
+def retained_memory(message_type, frames) -> dict:
+    tracemalloc.start()
+    messages = [message_type.deserialize(frame) for frame in frames]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    wire = sum(len(frame) for frame in frames)
+    del messages
+    return {"bytes_per_message": current / len(frames), "peak_bytes": peak, "ratio_to_wire": current / wire}
+
+
+def bench_messages(classes, message_names, schema, config, mode) -> dict:
+    rng = random.Random(42)
+    results = {}
+    for name in message_names:
+        message_type = getattr(classes, name)
+        values = [sample_value(schema, name, rng, config["list_size"]) for _ in range(config["messages"])]
+        objects = [message_type.from_dict(value) for value in values]
+        frames = [bytes(obj.serialize()) for obj in objects]
+        decoded = [message_type.deserialize(frame) for frame in frames]
+        transcoder = RTranscoder.of(message_type)
+        wire = sum(len(frame) for frame in frames) / len(frames)
+
+        timing = (config["min_time"], config["repeat"])
+        case = {"wire_bytes": wire}
+        for operation, function, items in (
+                ("serialize", lambda obj: obj.serialize(), objects),
+                ("deserialize", message_type.deserialize, frames),
+                ("to_dict", lambda obj: obj.to_dict(), decoded),
+                ("from_dict", message_type.from_dict, values),
+                ("transcoder_decode", transcoder.decode, frames),
+                ("transcoder_encode", transcoder.encode, values)):
+            ops = throughput(function, items, *timing)
+            case[operation] = {"ops_per_s": ops, "mb_per_s": ops * wire / 1e6}
+        case["latency_ns"] = {
+            "serialize": latency(lambda obj: obj.serialize(), objects, config["latency_samples"]),
+            "deserialize": latency(message_type.deserialize, frames, config["latency_samples"]),
+        }
+        case["memory"] = retained_memory(message_type, frames)
+        results[f"{mode}/{name}"] = case
+        print(f"{mode:>11} {name:<14} {wire:>9.0f} B  "
+              f"ser {case['serialize']['ops_per_s']:>10.0f}/s  des {case['deserialize']['ops_per_s']:>10.0f}/s  "
+              f"p99 {case['latency_ns']['deserialize']['p99'] / 1e3:>8.1f} us  "
+              f"mem x{case['memory']['ratio_to_wire']:.1f}", flush=True)
+    return results
+
+
+def bench_schema(schema: dict, modes) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "schema.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(schema, f, sort_keys=False)
+        start = time.perf_counter()
+        parser = RISParser(path)
+        results["load_s"] = time.perf_counter() - start
+        for mode in modes:
+            start = time.perf_counter()
+            parser.generate_classes(specialized=mode == "specialized")
+            results[f"generate_classes_{mode}_s"] = time.perf_counter() - start
+            start = time.perf_counter()
+            parser.generate_code(os.path.join(directory, f"out_{mode}"), specialized=mode == "specialized")
+            results[f"generate_code_{mode}_s"] = time.perf_counter() - start
+        cache_dir = os.path.join(directory, "cache")
+        for run in ("cold", "warm"):
+            start = time.perf_counter()
+            RISParser(path, cache_dir=cache_dir).generate_classes()
+            results[f"cached_startup_{run}_s"] = time.perf_counter() - start
+    results["structures"] = sum(len(schema.get(section, {})) for section in RISParser.section_types)
+    print("schema " + "  ".join(f"{key} {value:.3f}" for key, value in results.items()), flush=True)
+    return results
+
+
+def metadata() -> dict:
+    repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repository, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0],
+            "platform": platform.platform(), "numpy": getattr(numpy, "__version__", None)}
+
+
+def _flatten(data, prefix=""):
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f"{prefix}{key}", value
+
+
+def compare(results: dict, baseline: dict):
+    """Print new/old ratios; throughput > 1 and times/latencies/memory < 1 are improvements."""
+    old = dict(_flatten({"schema": baseline["schema"], "cases": baseline["cases"]}))
+    new = dict(_flatten({"schema": results["schema"], "cases": results["cases"]}))
+    print(f"\ncompared with {baseline['meta'].get('commit')}")
+    for key, value in new.items():
+        if key in old and old[key] and not key.endswith(("wire_bytes", "structures")):
+            ratio = value / old[key]
+            better = key.endswith(("ops_per_s", "mb_per_s")) == (ratio > 1)
+            mark = " " if abs(ratio - 1) < 0.02 else "+" if better else "-"
+            print(f"{key:<70} {ratio:>7.2f}x {mark}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="smaller schema and shorter timings")
+    parser.add_argument("--mode", choices=("generic", "specialized", "both"), default="both")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="results file of a previous run")
+    parser.add_argument("--only", nargs="*", help="message names to run (default: all)")
+    args = parser.parse_args(argv)
+
+    config = CONFIGS["quick" if args.quick else "full"]
+    schema = build_schema(config["list_size"], config["depth"], config["width"], config["enums"],
+                          config["enum_values"], numpy_lists=numpy is not None)
+    modes = ("generic", "specialized") if args.mode == "both" else (args.mode,)
+    message_names = args.only or list(schema["messages"])
+
+    results = {"meta": metadata(), "config": config, "schema": bench_schema(schema, modes), "cases": {}}
+    for mode in modes:
+        ris = RISParser()
+        ris.load_schema(schema)
+        classes, _ = ris.generate_classes(specialized=mode == "specialized")
+        results["cases"].update(bench_messages(classes, message_names, schema, config, mode))
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Synthetic RIS schemas for the benchmarks, modelled on the README examples
+(Header, SensorData, SensorStatus, SensorList, MeasurementUnion) and scaled up.
+"""
+import random
+import string
+
+INT_RANGES = {
+    "int8": (-2 ** 7, 2 ** 7 - 1), "int16": (-2 ** 15, 2 ** 15 - 1),
+    "int32": (-2 ** 31, 2 ** 31 - 1), "int64": (-2 ** 63, 2 ** 63 - 1),
+    "uint8": (0, 2 ** 8 - 1), "uint16": (0, 2 ** 16 - 1),
+    "uint32": (0, 2 ** 32 - 1), "uint64": (0, 2 ** 64 - 1),
+}
+WIDE_TYPES = ["int32", "float64", "uint8", "string16", "bool", "int16", "float32", "SensorStatus", "uint64"]
+
+
+def build_schema(list_size: int = 1000, depth: int = 8, width: int = 200, enums: int = 50,
+                 enum_values: int = 300, numpy_lists: bool = True) -> dict:
+    """
+    README-like schema plus scaled structures:
+      SensorMessage  - SensorData + MeasurementUnion (the README shapes)
+      SensorBatch    - SensorList of list_size SensorData
+      DeepMessage    - composites nested depth levels, each with a union
+      WideMessage    - a composite with width mixed fields
+      EnumMessage    - one field for each of enums enums with enum_values codes
+      WaveMessage    - array_backed float32 list of list_size samples (numpy_lists)
+    """
+    composites = {
+        "Header": {"fields": {"id": "uint16", "length": "uint32", "source": "uint8", "dest": "uint8", "seq": "uint32"}},
+        "SensorData": {"fields": {"id": "int32", "temperature": "float32", "status": "SensorStatus",
+                                  "name": "string16", "ok": "bool"}},
+    }
+    enums_section = {"SensorStatus": {"values": {"OK": 0, "WARNING": 1, "ERROR": 2}, "size_in_bytes": 4}}
+    arrays = {"SensorList": {"element_type": "SensorData", "length_field": "count"}}
+    unions = {"MeasurementUnion": {"possible_types": {"float_value": "float32", "int_value": "int32",
+                                                      "string_value": "string32"}}}
+    messages = {
+        "SensorMessage": {"fields": {"sensor": "SensorData", "measure": "MeasurementUnion"}},
+        "SensorBatch": {"fields": {"stamp": "int64", "count": "uint32", "sensors": "SensorList"}},
+    }
+
+    for level in range(depth):
+        fields = {"value": "int32", "name": "string8", "measure": "MeasurementUnion"}
+        if level + 1 < depth:
+            fields["child"] = f"Level{level + 1}"
+        composites[f"Level{level}"] = {"fields": fields}
+    messages["DeepMessage"] = {"fields": {"root": "Level0"}}
+
+    composites["Wide"] = {"fields": {f"f{i}": WIDE_TYPES[i % len(WIDE_TYPES)] for i in range(width)}}
+    messages["WideMessage"] = {"fields": {"wide": "Wide"}}
+
+    for index in range(enums):
+        enums_section[f"Enum{index}"] = {"values": {f"CODE_{index}_{value}": value * 3 for value in range(enum_values)},
+                                         "size_in_bytes": 2}
+    messages["EnumMessage"] = {"fields": {f"e{index}": f"Enum{index}" for index in range(enums)}}
+
+    if numpy_lists:
+        arrays["Wave"] = {"element_type": "float32", "length_field": "n", "array_backed": True}
+        messages["WaveMessage"] = {"fields": {"n": "uint32", "samples": "Wave"}}
+
+    for message_id, message in enumerate(messages.values(), start=100):
+        message.update(id=message_id, source=1, dest=2)
+    return {
+        "metadata": {"byte_order": "<", "enum_size_in_bytes": 4, "list_length_field_size": 4},
+        "composites": composites, "enums": enums_section, "arrays": arrays, "unions": unions, "messages": messages,
+    }
+
+
+def sample_value(schema: dict, type_name, rng: random.Random, list_size: int):
+    """Random value of type_name in to_dict()/from_dict() form."""
+    name = str(type_name).lower()
+    if name in INT_RANGES:
+        return rng.randint(*INT_RANGES[name])
+    if name in ("float", "float32", "float64", "double"):
+        return round(rng.uniform(-1000, 1000), 2)
+    if name == "bool":
+        return rng.random() < 0.5
+    if name.startswith("string"):
+        return "".join(rng.choices(string.ascii_letters, k=rng.randint(1, int(name[6:]))))
+    if type_name in schema.get("enums", {}):
+        return rng.choice(list(schema["enums"][type_name]["values"]))
+    if type_name in schema.get("arrays", {}):
+        array = schema["arrays"][type_name]
+        count = array["length_field"] if isinstance(array["length_field"], int) else list_size
+        return [sample_value(schema, array["element_type"], rng, list_size) for _ in range(count)]
+    if type_name in schema.get("unions", {}):
+        variant, variant_type = rng.choice(list(schema["unions"][type_name]["possible_types"].items()))
+        return {variant: sample_value(schema, variant_type, rng, list_size)}
+    struct_def = schema.get("composites", {}).get(type_name) or schema["messages"][type_name]
+    value = {field: sample_value(schema, field_type, rng, list_size)
+             for field, field_type in struct_def.get("fields", {}).items()}
+    # I campi usati come lunghezza di una lista devono corrispondere al numero di elementi
+    for field, field_type in struct_def.get("fields", {}).items():
+        array = schema.get("arrays", {}).get(field_type)
+        if array is not None and not isinstance(array["length_field"], int):
+            value[array["length_field"]] = len(value[field])
+    return value
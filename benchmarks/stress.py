@@ -0,0 +1,79 @@
+"""
+Concurrency benchmark for encoding/decoding.
+
+    python -m rip.benchmarks.stress [--threads 8] [--iterations 2000] [--mode generic|specialized|both]
+
+Many threads serialize and deserialize instances of the same message classes at the same time
+(shared classes, distinct values); serialize_many / deserialize_many are timed for 1..N workers.
+The correctness checks under contention are in tests/test_threads.py.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+
+from rip.core import RISParser, serialize_many, deserialize_many
+from rip.benchmarks.schemas import build_schema, sample_value
+
+
+def hammer(classes, names, schema, iterations, seed, barrier):
+    rng = random.Random(seed)
+    # Liste di lunghezza diversa per thread: header.length cambia da un messaggio all'altro
+    cases = [[getattr(classes, name).from_dict(sample_value(schema, name, rng, rng.randint(0, 40))) for _ in range(4)]
+             for name in names]
+    barrier.wait()
+    for iteration in range(iterations):
+        message = cases[iteration % len(cases)][iteration % 4]
+        type(message).deserialize(message.serialize())
+
+
+def bench_threads(classes, schema, threads: int, iterations: int) -> float:
+    names = [name for name in schema["messages"] if name != "WideMessage"]
+    barrier = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=hammer, args=(classes, names, schema, iterations, seed, barrier))
+               for seed in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def bench_many(classes, schema, message_map, threads: int, count: int):
+    rng = random.Random(7)
+    messages = [classes.SensorMessage.from_dict(sample_value(schema, "SensorMessage", rng, 10)) for _ in range(count)]
+    for workers in sorted({1, 2, threads}):
+        start = time.perf_counter()
+        frames = serialize_many(messages, workers=workers)
+        encode = time.perf_counter() - start
+        start = time.perf_counter()
+        deserialize_many(frames, message_map, workers=workers)
+        decode = time.perf_counter() - start
+        print(f"  {workers:>3} workers  serialize_many {count / encode:>10.0f}/s  deserialize_many {count / decode:>10.0f}/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=2000, help="messages encoded per thread")
+    parser.add_argument("--mode", choices=("generic", "specialized", "both"), default="both")
+    args = parser.parse_args(argv)
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    schema = build_schema(list_size=50, depth=4, width=20, enums=5, enum_values=20, numpy_lists=False)
+    for mode in (("generic", "specialized") if args.mode == "both" else (args.mode,)):
+        ris = RISParser()
+        ris.load_schema(schema)
+        classes, message_map = ris.generate_classes(specialized=mode == "specialized")
+        elapsed = bench_threads(classes, schema, args.threads, args.iterations)
+        print(f"{mode}: {args.threads} threads x {args.iterations} round trips in {elapsed:.2f}s "
+              f"({args.threads * args.iterations / elapsed:.0f}/s)")
+        bench_many(classes, schema, message_map, args.threads, 20 * args.iterations)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,4 +7,14 @@ from .rcomposite import RComposite
 from .rlist import RList
 from .runion import RUnion
 from .rmessage import RMessage
+from .rview import RView
+from .rprojection import RProjection
+from .rfield import RField
+from .rtranscoder import RTranscoder
 from .ris_parser import RISParser
+from .rstream import RHeaderReader, RStreamDecoder
+from .rasyncio import RMessageProtocol, RMessageWriter, read_messages
+from .rcapture import RCapture
+from .rparallel import RParallelDecoder
+from .rcolumns import RColumnSink
+from .rthreads import serialize_many, deserialize_many
@@ -0,0 +1,175 @@
+import asyncio
+from .rstream import RStreamDecoder
+
+
+class RMessageProtocol(asyncio.Protocol):
+    """
+    asyncio Protocol for RMessage streams.
+    Incoming frames are dispatched on Header.id: messages whose id has a handler are passed (in order)
+    to that async handler, the others are delivered to `async for message in protocol`.
+    Outgoing messages are coalesced and written once per loop iteration, or every `batch_size` bytes.
+    """
+
+    def __init__(self, message_map: dict, handlers: dict = None, header_type=None,
+                 max_queue: int = 1024, batch_size: int = 64 * 1024):
+        self.decoder = RStreamDecoder(message_map, header_type)
+        self.handlers = handlers or {}
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.transport = None
+        self._loop = None
+        self._messages = asyncio.Queue()
+        self._handled = asyncio.Queue()
+        self._dispatcher = None
+        self._error = None
+        self._reading_paused = False
+        self._writing_paused = False
+        self._drain_waiters = []
+        self._out = bytearray()
+        self._flush_handle = None
+
+    # Lettura
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self._loop = asyncio.get_running_loop()
+        if self.handlers:
+            self._dispatcher = self._loop.create_task(self._dispatch())
+        self.flush()
+
+    def data_received(self, data):
+        try:
+            for message in self.decoder.feed(data):
+                (self._handled if message.id in self.handlers else self._messages).put_nowait(message)
+        except (KeyError, ValueError) as exc:
+            self._error = exc
+            self.transport.close()
+            return
+        if not self._reading_paused and max(self._messages.qsize(), self._handled.qsize()) >= self.max_queue:
+            self._reading_paused = True
+            self.transport.pause_reading()
+
+    def connection_lost(self, exc):
+        self._error = self._error or exc
+        self._messages.put_nowait(None)
+        self._handled.put_nowait(None)
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_exception(ConnectionResetError("Connection lost"))
+        self._drain_waiters.clear()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self._messages.get()
+        if message is None:
+            self._messages.put_nowait(None)
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration
+        self._maybe_resume_reading()
+        return message
+
+    async def _dispatch(self):
+        while (message := await self._handled.get()) is not None:
+            self._maybe_resume_reading()
+            try:
+                await self.handlers[message.id](message)
+            except Exception as exc:
+                self._loop.call_exception_handler({
+                    'message': f"Handler error for message id {message.id}",
+                    'exception': exc,
+                    'protocol': self,
+                })
+
+    def _maybe_resume_reading(self):
+        if self._reading_paused and max(self._messages.qsize(), self._handled.qsize()) < self.max_queue:
+            self._reading_paused = False
+            self.transport.resume_reading()
+
+    # Scrittura
+
+    def send(self, message):
+        self._out += message.serialize()
+        if len(self._out) >= self.batch_size:
+            self.flush()
+        elif self._flush_handle is None and self._loop is not None:
+            self._flush_handle = self._loop.call_soon(self.flush)
+
+    def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._out and self.transport is not None and not self.transport.is_closing():
+            # The transport may keep a reference to the written buffer: never reuse it
+            data, self._out = self._out, bytearray()
+            self.transport.write(data)
+
+    async def drain(self):
+        self.flush()
+        if self.transport is not None and self.transport.is_closing():
+            raise ConnectionResetError("Connection lost")
+        if self._writing_paused:
+            waiter = self._loop.create_future()
+            self._drain_waiters.append(waiter)
+            await waiter
+
+    def pause_writing(self):
+        self._writing_paused = True
+
+    def resume_writing(self):
+        self._writing_paused = False
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._drain_waiters.clear()
+
+    def close(self):
+        self.flush()
+        if self.transport is not None:
+            self.transport.close()
+
+
+async def read_messages(reader: asyncio.StreamReader, message_map: dict, header_type=None, chunk_size: int = 64 * 1024):
+    """Async generator of the messages read from a StreamReader."""
+    decoder = RStreamDecoder(message_map, header_type)
+    while data := await reader.read(chunk_size):
+        for message in decoder.feed(data):
+            yield message
+    if decoder.pending:
+        raise asyncio.IncompleteReadError(b"", None)
+
+
+class RMessageWriter:
+    """Coalesces serialized messages into few StreamWriter.write calls; drain() applies backpressure."""
+
+    def __init__(self, writer: asyncio.StreamWriter, batch_size: int = 64 * 1024):
+        self.writer = writer
+        self.batch_size = batch_size
+        self._out = bytearray()
+        self._flush_handle = None
+
+    def send(self, message):
+        self._out += message.serialize()
+        if len(self._out) >= self.batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self.flush)
+
+    def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._out:
+            data, self._out = self._out, bytearray()
+            self.writer.write(data)
+
+    async def drain(self):
+        self.flush()
+        await self.writer.drain()
+
+    async def close(self):
+        self.flush()
+        self.writer.close()
+        await self.writer.wait_closed()
@@ -2,6 +2,9 @@ import struct
 from .rserializable import RSerializable
 
 class RBool(int, RSerializable):
+    __slots__ = ()
+    _plain_type = bool
+
     def __new__(cls, value=False):
         obj = int.__new__(cls, 1 if value else 0)
         return obj
@@ -11,8 +14,11 @@ class RBool(int, RSerializable):
 
     @classmethod
     def deserialize(cls, data: bytearray):
-        value = struct.unpack("?", data[:1])[0]
-        return cls(value)
+        return cls.deserialize_from(data)[0]
+
+    @classmethod
+    def _fixed_format(cls):
+        return "?"
 
     def to_dict(self) -> bool:
         return bool(self)
@@ -0,0 +1,137 @@
+import mmap
+import os
+import struct
+from array import array
+from .rstream import RHeaderReader
+
+
+class RCapture:
+    """
+    Random access to a capture file of back-to-back RMessage frames.
+    The file is memory-mapped and scanned once (Header only) to build an index of frame offsets and ids,
+    which can be saved next to the capture and is reused while the capture is unchanged.
+    """
+    index_suffix = ".ridx"
+    _index_header = struct.Struct("<4sBQqQ1s")  # magic, version, capture size, capture mtime_ns, frames, id typecode
+
+    def __init__(self, path: str, message_map: dict, header_type=None, index_path: str = None):
+        self.path = path
+        self.index_path = index_path or path + self.index_suffix
+        self.message_map = message_map
+        if header_type is None:
+            header_type = type(next(iter(message_map.values())).header)
+        self.header = RHeaderReader(header_type)
+        self._id_typecode = header_type.__annotations__["id"]._fixed_format()
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._view = memoryview(self._mmap) if size else memoryview(b"")
+        self.offsets = array("Q")  # len(self) + 1 entries: the last one is the end of the last frame
+        self.ids = array(self._id_typecode)
+        if not self.load_index():
+            self.build_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Close the capture file. Frames returned by frame() and lazy messages are views on the mapping:
+        if some are still referenced the mapping stays valid and is unmapped once they are released.
+        """
+        try:
+            self._view.release()
+            if self._mmap is not None:
+                self._mmap.close()
+        except BufferError:
+            # Viste esportate ancora in uso: la mappatura si chiude quando il garbage collector le rilascia
+            pass
+        finally:
+            self._file.close()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index: int):
+        return self.message(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.message(index)
+
+    @property
+    def truncated(self) -> bool:
+        """True if the capture ends with an incomplete frame (not indexed)."""
+        return self.offsets[-1] != len(self._view)
+
+    def build_index(self):
+        offsets, ids = array("Q"), array(self._id_typecode)
+        peek, header_size, end = self.header.peek, self.header.size, len(self._view)
+        offset = 0
+        while offset + header_size <= end:
+            message_id, length = peek(self._view, offset)
+            if length < header_size:
+                raise ValueError(f"Lunghezza del frame non valida ({length}) all'offset {offset}")
+            if offset + length > end:
+                break
+            offsets.append(offset)
+            ids.append(message_id)
+            offset += length
+        offsets.append(offset)
+        self.offsets, self.ids = offsets, ids
+
+    def save_index(self):
+        stat = os.stat(self.path)
+        with open(self.index_path, "wb") as file:
+            file.write(self._index_header.pack(b"RIDX", 1, stat.st_size, stat.st_mtime_ns, len(self.ids),
+                                               self._id_typecode.encode()))
+            self.offsets.tofile(file)
+            self.ids.tofile(file)
+
+    def load_index(self) -> bool:
+        """Load the saved index if it matches the current capture; returns False otherwise."""
+        if not os.path.exists(self.index_path):
+            return False
+        stat = os.stat(self.path)
+        with open(self.index_path, "rb") as file:
+            magic, version, size, mtime_ns, count, typecode = self._index_header.unpack(
+                file.read(self._index_header.size).ljust(self._index_header.size, b"\x00"))
+            if (magic, version, size, mtime_ns, typecode) != (b"RIDX", 1, stat.st_size, stat.st_mtime_ns,
+                                                              self._id_typecode.encode()):
+                return False
+            offsets, ids = array("Q"), array(self._id_typecode)
+            try:
+                offsets.fromfile(file, count + 1)
+                ids.fromfile(file, count)
+            except EOFError:
+                return False
+        self.offsets, self.ids = offsets, ids
+        return True
+
+    def frame(self, index: int) -> memoryview:
+        """Raw bytes of a frame (a view on the mapped file, no copy; it stays valid after close())."""
+        if index < 0:
+            index += len(self)
+        return self._view[self.offsets[index]:self.offsets[index + 1]]
+
+    def message(self, index: int, lazy: bool = False):
+        """Decoded message; with lazy=True a view on the mapped file (see RMessage.view)."""
+        if index < 0:
+            index += len(self)
+        message_type = self.message_map[self.ids[index]]
+        if lazy:
+            return message_type.view(self.frame(index))
+        return message_type.deserialize_from(self._view[self.offsets[index]:self.offsets[index + 1]])[0]
+
+    def indices(self, ids) -> list:
+        """Positions of the frames whose id is in ids."""
+        ids = set(ids)
+        return [index for index, message_id in enumerate(self.ids) if message_id in ids]
+
+    def filter(self, ids):
+        """Decode only the messages whose id is in ids, in capture order."""
+        for index in self.indices(ids):
+            yield self.message(index)
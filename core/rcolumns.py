@@ -0,0 +1,333 @@
+import json
+import os
+import struct
+from types import SimpleNamespace
+from .rstring import RString
+from .renum import REnum
+from .rlist import RList
+from .runion import RUnion
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class RColumnSink:
+    """
+    Fills per-field NumPy columns from a stream of frames of one RMessage type, without building messages.
+    Column names are the field paths ("header.id", "sensor.temperature"); a list with a length_field
+    becomes "path[offsets]" (cumulative end offset of each row) plus "path[values]" / "path[values].field",
+    a union "path[tag]" plus one "path[variant]" column per variant (zero/empty when not selected),
+    a list with a fixed length a column of shape (rows, length). Enums are stored as codes.
+    Values are collected in chunks of chunk_rows rows; with a directory, every flush_rows rows
+    the columns are written as part-NNNNN/<column>.npy (see load()).
+    """
+    metadata_file = "columns.json"
+
+    def __init__(self, message_type, directory: str = None, chunk_rows: int = 65536, flush_rows: int = 1 << 20):
+        if np is None:
+            raise ImportError("numpy is required for columnar export.")
+        self.message_type = message_type
+        self.byte_order = message_type.byte_order
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.flush_rows = flush_rows
+        self.rows = 0  # rows appended since the last flush
+        self._parts = 0
+        self._columns = {}
+        self._root = self._node(message_type._wire_fields(), "", "", (), [])
+        # Layout fisso: i frame si accumulano grezzi e si decodificano a blocchi con un dtype strutturato
+        self._frame_size = message_type.static_size()
+        self._raw = bytearray()
+        self._pending = 0
+
+    def append(self, frame):
+        """Add one frame (header included) of message_type."""
+        if self._frame_size is not None:
+            if len(frame) != self._frame_size:
+                raise ValueError(f"Frame di {len(frame)} byte, {self.message_type.__name__} ne richiede {self._frame_size}")
+            self._raw += frame
+        else:
+            self._root.fill(frame, 0, None)
+        self._pending += 1
+        self.rows += 1
+        if self._pending >= self.chunk_rows:
+            self._close_chunk()
+            if self.directory is not None and self.rows >= self.flush_rows:
+                self.flush()
+
+    def extend(self, frames):
+        for frame in frames:
+            self.append(frame)
+
+    def columns(self) -> dict:
+        """In-memory columns (rows appended since the last flush)."""
+        self._close_chunk()
+        return {name: self._concatenate(column) for name, column in self._columns.items()}
+
+    def flush(self):
+        """Write the rows collected so far as a new part of directory."""
+        if self.directory is None:
+            raise ValueError("RColumnSink senza directory: usare columns()")
+        self._close_chunk()
+        if not self.rows:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if self._parts == 0:
+            metadata = {"message": self.message_type.__name__, "columns": {
+                name: {"file": column.file, "table": column.table, "dtype": column.dtype.str,
+                       "symbols": column.symbols} for name, column in self._columns.items()}}
+            with open(os.path.join(self.directory, self.metadata_file), "w") as file:
+                json.dump(metadata, file, indent=1)
+        part = os.path.join(self.directory, f"part-{self._parts:05d}")
+        os.makedirs(part, exist_ok=True)
+        for column in self._columns.values():
+            np.save(os.path.join(part, column.file), self._concatenate(column))
+            column.chunks = []
+        self._parts += 1
+        self.rows = 0
+
+    def close(self):
+        if self.directory is not None:
+            self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+
+    @classmethod
+    def load(cls, directory: str, table: str = None, mmap_mode: str = None) -> dict:
+        """
+        Columns written by flush(), parts concatenated: {name: array}. With table="" only the
+        one-value-per-message columns (ready for a DataFrame), with table="path" the columns of that list.
+        """
+        with open(os.path.join(directory, cls.metadata_file)) as file:
+            metadata = json.load(file)
+        parts = sorted(entry for entry in os.listdir(directory) if entry.startswith("part-"))
+        result = {}
+        for name, column in metadata["columns"].items():
+            if table is not None and column["table"] != table:
+                continue
+            arrays = [np.load(os.path.join(directory, part, column["file"] + ".npy"), mmap_mode=mmap_mode)
+                      for part in parts]
+            result[name] = arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+        return result
+
+    # Colonne
+
+    def _column(self, name, fmt, table, shape, enum_type=None):
+        if name in self._columns:
+            raise ValueError(f"Colonna {name} duplicata")
+        dtype = np.dtype(f"S{fmt[:-1]}" if fmt.endswith("s") else fmt if fmt == "?" else self.byte_order + fmt)
+        symbols = None if enum_type is None else {str(code): symbol for code, symbol in enum_type.symbols.items()}
+        column = SimpleNamespace(name=name, dtype=dtype, table=table, shape=shape, enum_type=enum_type,
+                                 symbols=symbols, file=name, fields=None, values=[], chunks=[])
+        self._columns[name] = column
+        return column
+
+    def _close_chunk(self):
+        if self._frame_size is not None and self._raw:
+            records = np.frombuffer(self._raw, self._root.dtype)
+            for column in self._columns.values():
+                values = records
+                for field in column.fields:
+                    values = values[field]
+                self._add_chunk(column, values.copy())
+            self._raw = bytearray()
+        for column in self._columns.values():
+            if column.values:
+                values = np.array(column.values, column.dtype)
+                self._add_chunk(column, values.reshape(-1, *column.shape) if column.shape else values)
+                column.values.clear()  # la lista è condivisa con le closure di compilazione
+        self._pending = 0
+
+    def _add_chunk(self, column, values):
+        if column.enum_type is not None and values.size:
+            column.enum_type.check_codes(values)
+        column.chunks.append(values)
+
+    def _concatenate(self, column):
+        if not column.chunks:
+            return np.zeros((0, *column.shape), column.dtype)
+        if len(column.chunks) > 1:
+            column.chunks = [np.concatenate(column.chunks)]
+        return column.chunks[0]
+
+    # Compilazione: ogni nodo ha fill(buffer, offset, lengths) -> offset e blank() (riga vuota per le union);
+    # i nodi a dimensione fissa hanno anche fmt/take(values, index) -> index e un dtype strutturato
+
+    def _node(self, fields, path, table, shape, names):
+        nodes = [(field, self._type_node(field_type, path + field, table, shape, names + [field]))
+                 for field, field_type in fields]
+        length_fields = {field_type.length_field for _, field_type in fields
+                         if issubclass(field_type, RList) and not isinstance(field_type.length_field, int)}
+        if all(node.fmt is not None for _, node in nodes):
+            dtype = np.dtype([(field, node.dtype) for field, node in nodes])
+            return self._static(SimpleNamespace(fmt="".join(node.fmt for _, node in nodes), dtype=dtype,
+                                                take=self._take_all([node for _, node in nodes]),
+                                                blank=self._blank_all([node for _, node in nodes])))
+
+        # Campi fissi consecutivi letti con un solo Struct, come in RTranscoder
+        segments = []
+        for field, node in nodes:
+            if node.fmt is not None and segments and segments[-1][0] is not None:
+                segments[-1][1].append((field, node))
+            elif node.fmt is not None:
+                segments.append([True, [(field, node)]])
+            else:
+                segments.append([None, node])
+        for segment in segments:
+            if segment[0] is not None:
+                content = segment[1]
+                segment[0] = struct.Struct(self.byte_order + "".join(node.fmt for _, node in content))
+                positions, index = [], 0
+                for field, node in content:
+                    if field in length_fields:
+                        positions.append((field, index))
+                    index += len(struct.Struct(self.byte_order + node.fmt).unpack(bytes(node.dtype.itemsize)))
+                segment[1] = (self._take_all([node for _, node in content]), positions)
+
+        def fill(buffer, offset, _):
+            lengths = {}
+            for codec, content in segments:
+                if codec is None:
+                    offset = content.fill(buffer, offset, lengths)
+                else:
+                    take, positions = content
+                    values = codec.unpack_from(buffer, offset)
+                    take(values, 0)
+                    for field, index in positions:
+                        lengths[field] = values[index]
+                    offset += codec.size
+            return offset
+
+        return SimpleNamespace(fmt=None, fill=fill, blank=self._blank_all([node for _, node in nodes]))
+
+    def _type_node(self, field_type, path, table, shape, names):
+        if issubclass(field_type, RList):
+            return self._list(field_type, path, table, shape, names)
+        if issubclass(field_type, RUnion):
+            return self._union(field_type, path, table, shape)
+        if hasattr(field_type, "_wire_fields"):
+            return self._node(field_type._wire_fields(), path + ".", table, shape, names)
+        fmt = field_type._fixed_format()
+        column = self._column(path, fmt, table, shape, field_type if issubclass(field_type, REnum) else None)
+        column.fields = names
+        values = column.values
+        empty = b"" if issubclass(field_type, RString) else 0
+
+        def take(raw, index):
+            values.append(raw[index])
+            return index + 1
+
+        return self._static(SimpleNamespace(fmt=fmt, dtype=column.dtype, take=take,
+                                            blank=lambda: values.append(empty)))
+
+    def _static(self, node):
+        codec = struct.Struct(self.byte_order + node.fmt)
+        take = node.take
+
+        def fill(buffer, offset, _):
+            take(codec.unpack_from(buffer, offset), 0)
+            return offset + codec.size
+
+        node.fill = fill
+        return node
+
+    @staticmethod
+    def _take_all(nodes):
+        def take(values, index):
+            for node in nodes:
+                index = node.take(values, index)
+            return index
+        return take
+
+    @staticmethod
+    def _blank_all(nodes):
+        def blank():
+            for node in nodes:
+                node.blank()
+        return blank
+
+    def _list(self, list_type, path, table, shape, names):
+        length_field = list_type.length_field
+        if isinstance(length_field, int):
+            # Lunghezza fissa: una colonna (righe, length) per ogni campo dell'elemento
+            element = self._type_node(list_type.element_type, path, table, shape + (length_field,), names)
+            element_take, element_fill, element_blank = getattr(element, "take", None), element.fill, element.blank
+
+            def fill(buffer, offset, lengths):
+                for _ in range(length_field):
+                    offset = element_fill(buffer, offset, None)
+                return offset
+
+            def blank():
+                for _ in range(length_field):
+                    element_blank()
+
+            if element.fmt is None:
+                return SimpleNamespace(fmt=None, fill=fill, blank=blank)
+
+            def take(values, index):
+                for _ in range(length_field):
+                    index = element_take(values, index)
+                return index
+
+            return self._static(SimpleNamespace(fmt=element.fmt * length_field, take=take, blank=blank,
+                                                dtype=np.dtype((element.dtype, (length_field,)))))
+
+        offsets = self._column(f"{path}[offsets]", "q", table, shape).values
+        element = self._type_node(list_type.element_type, f"{path}[values]", path, (), [])
+        element_fill = element.fill
+        state = SimpleNamespace(total=0)
+
+        if element.fmt is not None and hasattr(element, "dtype") and not element.dtype.names \
+                and not element.dtype.subdtype:
+            # Elementi scalari: un solo unpack per lista
+            element_values = self._columns[f"{path}[values]"].values
+            element_fmt = element.fmt
+            element_size = struct.calcsize(self.byte_order + element_fmt)
+
+            def fill(buffer, offset, lengths):
+                count = lengths[length_field]
+                element_values.extend(struct.unpack_from(f"{self.byte_order}{count}{element_fmt}", buffer, offset))
+                state.total += count
+                offsets.append(state.total)
+                return offset + count * element_size
+        else:
+            def fill(buffer, offset, lengths):
+                count = lengths[length_field]
+                for _ in range(count):
+                    offset = element_fill(buffer, offset, None)
+                state.total += count
+                offsets.append(state.total)
+                return offset
+
+        return SimpleNamespace(fmt=None, fill=fill, blank=lambda: offsets.append(state.total))
+
+    def _union(self, union_type, path, table, shape):
+        tag_codec = union_type._tag_struct()
+        tags = self._column(f"{path}[tag]", tag_codec.format[1:], table, shape).values
+        variants = [self._type_node(variant, f"{path}[{name}]", table, shape, [])
+                    for name, variant in union_type._variants]
+        others = [[other.blank for other in variants if other is not node] for node in variants]
+
+        def fill(buffer, offset, lengths):
+            tag, = tag_codec.unpack_from(buffer, offset)
+            if tag >= len(variants):
+                raise ValueError(f"Tag {tag} non valido per {union_type.__name__}")
+            tags.append(tag)
+            for blank in others[tag]:
+                blank()
+            return variants[tag].fill(buffer, offset + tag_codec.size, None)
+
+        def blank():
+            tags.append(0)
+            for variant in variants:
+                variant.blank()
+
+        return SimpleNamespace(fmt=None, fill=fill, blank=blank)
@@ -1,8 +1,14 @@
 from .rserializable import RSerializable
 from .rlist import RList
+from .rview import RView
+from .rprojection import RProjection
+from .rfield import RField, _skip_fields
+
 
 class RComposite(RSerializable):
-    def __new__(cls):
+    unboxed = False  # scalar fields kept as plain int/float/str/bool
+
+    def __new__(cls, *args, **kwargs):
         obj = super().__new__(cls)
         return obj
 
@@ -11,47 +17,149 @@ class RComposite(RSerializable):
             field_value = kwargs.get(field, None)
 
             if isinstance(field_value, field_type):
-                setattr(self, field, field_value)
+                value = field_value
             elif field_value is not None:
-                setattr(self, field, field_type(field_value))
+                value = field_type(field_value)
             else:
-                setattr(self, field, field_type())  # Crea un'istanza di default
+                value = field_type()  # Crea un'istanza di default
+            setattr(self, field, field_type._unboxed(value) if self.unboxed else value)
 
     def serialize(self) -> bytearray:
-        data = bytearray()
-        for field in self.__annotations__:
-            value = getattr(self, field)
-            data.extend(value.serialize())
+        data = bytearray(self.size_in_bytes())
+        self.serialize_into(data)
         return data
 
+    def serialize_into(self, buffer, offset: int = 0) -> int:
+        if self._compiled_struct() is not None:
+            return super().serialize_into(buffer, offset)
+        for field, field_type in self.__annotations__.items():
+            offset = self._field_value(field, field_type).serialize_into(buffer, offset)
+        return offset
+
     @classmethod
     def deserialize(cls, data: bytearray):
-        obj = cls()
-        offset = 0
+        return cls.deserialize_from(memoryview(data))[0]
+
+    @classmethod
+    def deserialize_from(cls, buffer, offset: int = 0):
+        codec = cls._compiled_struct()
+        if codec is not None:
+            return cls._unpack_values(codec.unpack_from(buffer, offset), 0)[0], offset + codec.size
+        obj = cls.__new__(cls)
         for field, field_type in cls.__annotations__.items():
             if issubclass(field_type, RList):
-                value = field_type.deserialize(data[offset:], obj)
+                value, offset = field_type.deserialize_from(buffer, offset, obj)
+            else:
+                value, offset = field_type.deserialize_from(buffer, offset)
+            setattr(obj, field, field_type._unboxed(value) if cls.unboxed else value)
+        return obj, offset
+
+    @classmethod
+    def view(cls, buffer, offset: int = 0):
+        """Lazy instance over buffer: fields are decoded on first access."""
+        return RView._view_class(cls, cls._wire_fields())._from_buffer(buffer, offset)
+
+    @classmethod
+    def project(cls, data, fields, offset: int = 0, to_dict: bool = False) -> dict:
+        """Decode only the given field paths (e.g. "status", "inner.id"): {path: value}."""
+        return RProjection.of(cls, fields).decode(data, offset, to_dict)
+
+    @classmethod
+    def field(cls, path: str) -> RField:
+        """Fixed-size field at path, read/written in place in serialized data (see RField)."""
+        return RField.of(cls, path)
+
+    @classmethod
+    def _wire_fields(cls):
+        # (name, type) of the encoded fields, in wire order
+        return list(cls.__annotations__.items())
+
+    @classmethod
+    def _fixed_format(cls):
+        formats = [field_type._fixed_format() for field_type in cls.__annotations__.values()]
+        return None if None in formats else "".join(formats)
+
+    @classmethod
+    def static_size(cls):
+        # Somma dei campi: fissa anche quando un campo (lista array_backed) non ha un formato struct
+        cache = cls.__dict__.get("_size_cache")
+        if cache is None or cache[0] != cls.byte_order:
+            sizes = [field_type.static_size() for _, field_type in cls._wire_fields()]
+            cache = (cls.byte_order, None if None in sizes else sum(sizes))
+            cls._size_cache = cache
+        return cache[1]
+
+    @classmethod
+    def _skip(cls, buffer, offset: int, obj_ref=None) -> int:
+        size = cls.static_size()
+        if size is not None:
+            return offset + size
+        return _skip_fields(cls._wire_fields(), buffer, offset)
+
+    @classmethod
+    def _field_offsets(cls):
+        # Offset of each field known without decoding (None after the first variable-size field)
+        offsets, offset = {}, 0
+        for field, field_type in cls.__annotations__.items():
+            offsets[field] = offset
+            size = field_type.static_size()
+            offset = offset + size if offset is not None and size is not None else None
+        return offsets
+
+    @classmethod
+    def _unpack_values(cls, values, index):
+        obj = cls.__new__(cls)
+        for field, field_type in cls.__annotations__.items():
+            if cls.unboxed:
+                value, index = field_type._unpack_unboxed(values, index)
             else:
-                value = field_type.deserialize(data[offset:])
+                value, index = field_type._unpack_values(values, index)
             setattr(obj, field, value)
-            offset += len(value.serialize())
-        return obj
+        return obj, index
+
+    def _pack_values(self, values: list):
+        for field, field_type in self.__annotations__.items():
+            self._field_value(field, field_type)._pack_values(values)
 
     def to_dict(self) -> dict:
-        return {field: getattr(self, field).to_dict() for field in self.__annotations__}
+        return {field: self._field_value(field, field_type).to_dict() for field, field_type in self.__annotations__.items()}
 
     @classmethod
     def from_dict(cls, data):
         obj = cls()
-        for field, field_type in cls.__annotations__.items():
-            setattr(obj, field, field_type.from_dict(data[field]))
+        for field in cls.__annotations__:
+            obj._set_field(field, data[field])
         return obj
 
+    def _set_field(self, field, data):
+        # Assign a field from its to_dict() form
+        field_type = self.__annotations__[field]
+        value = field_type.from_dict(data)
+        setattr(self, field, field_type._unboxed(value) if self.unboxed else value)
+
     def size_in_bytes(self) -> int:
-        return sum(len(getattr(self, field).serialize()) for field in self.__annotations__)
+        size = self.static_size()
+        if size is not None:
+            return size
+        size = 0
+        for field, field_type in self.__annotations__.items():
+            field_size = field_type.static_size()
+            size += field_size if field_size is not None else getattr(self, field).size_in_bytes()
+        return size
+
+    def _copy(self):
+        # Shallow copy: nested composites/lists are shared with the original
+        obj = self.__class__.__new__(self.__class__)
+        obj.__dict__.update(self.__dict__)
+        return obj
+
+    def _field_value(self, field, field_type):
+        # Field as an RSerializable: unboxed scalars are wrapped only when needed
+        value = getattr(self, field)
+        return field_type._boxed(value) if self.unboxed else value
 
     def default(self):
-        res = {field: getattr(self, field).default() for field in self.__annotations__}
+        res = {field: self._field_value(field, field_type).default() for field, field_type in self.__annotations__.items()}
         for field in self.__annotations__:
             if issubclass(getattr(self, field).__class__, RList):
                 if not isinstance(getattr(self, field).length_field, int):
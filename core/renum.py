@@ -1,46 +1,106 @@
 import struct
 from .rserializable import RSerializable
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class REnum(int, RSerializable):
+    __slots__ = ()
     size_in_bytes = 1
     values: dict = {}
+    _plain_type = int
     symbols: dict = {}
+    _members: dict = {}  # value -> singleton instance
+    _by_name: dict = {}  # name -> singleton instance
+    _default = None
 
     def __new__(cls, value=None):
-        if not cls.values:
-            raise ValueError(f"Enum {cls.__name__} non ha valori definiti.")
         if value is None:
-            value = list(cls.values.values())[0]
-        if value not in cls.values.values():
+            if cls._default is None:
+                raise ValueError(f"Enum {cls.__name__} non ha valori definiti.")
+            return cls._default
+        member = cls._members.get(value)
+        if member is None:
             raise ValueError(f"Valore {value} non valido per {cls.__name__}")
-        obj = super().__new__(cls, value)
-        return obj
+        return member
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         if not hasattr(cls, "values") or not cls.values:
             raise ValueError(f"La classe {cls.__name__} deve avere un attributo 'values'.")
         cls.symbols = {v: k for k, v in cls.values.items()}
+        cls._members = {value: int.__new__(cls, value) for value in cls.symbols}
+        cls._by_name = {name: cls._members[value] for name, value in cls.values.items()}
+        cls._default = cls._members[next(iter(cls.values.values()))]
+        cls._code_table = None
 
     @classmethod
     def from_value(cls, value: int):
-        if value in cls.symbols:
-            return cls(value)
-        raise ValueError(f"Valore {value} non valido per {cls.__name__}")
+        member = cls._members.get(value)
+        if member is None:
+            raise ValueError(f"Valore {value} non valido per {cls.__name__}")
+        return member
 
     @classmethod
     def from_string(cls, name: str):
-        if name in cls.values:
-            return cls(cls.values[name])
-        raise ValueError(f"Nome {name} non valido per {cls.__name__}")
+        member = cls._by_name.get(name)
+        if member is None:
+            raise ValueError(f"Nome {name} non valido per {cls.__name__}")
+        return member
+
+    @classmethod
+    def from_values(cls, values) -> list:
+        """Members for a sequence of raw codes, e.g. the items of an enum list."""
+        members = cls._members
+        try:
+            return [members[value] for value in values]
+        except KeyError as e:
+            raise ValueError(f"Valore {e.args[0]} non valido per {cls.__name__}") from None
+
+    @classmethod
+    def check_codes(cls, codes):
+        """Validate a numpy array of raw codes in one pass; returns it unchanged."""
+        if cls._code_table is None:
+            values = np.array(sorted(cls.symbols), dtype=np.int64)
+            span = int(values[-1] - values[0]) + 1
+            # Tabella di lookup per enum densi, ricerca ordinata per quelli sparsi
+            mask = np.zeros(span, bool) if span <= 1 << 16 else None
+            if mask is not None:
+                mask[values - values[0]] = True
+            cls._code_table = (values, mask)
+        values, mask = cls._code_table
+        if mask is None:
+            valid = np.isin(codes, values)
+        else:
+            index = codes.astype(np.int64) - values[0]
+            inside = (index >= 0) & (index < len(mask))
+            valid = inside & mask[np.where(inside, index, 0)]
+        if not valid.all():
+            raise ValueError(f"Valore {codes[~valid][0]} non valido per {cls.__name__}")
+        return codes
 
     def serialize(self):
         return struct.pack(f"{self.byte_order}{self._get_format(self.size_in_bytes)}", int(self))
 
     @classmethod
     def deserialize(cls, data: bytearray):
-        value = struct.unpack(f"{cls.byte_order}{cls._get_format(cls.size_in_bytes)}", data[:cls.size_in_bytes])[0]
-        return cls.from_value(value)
+        return cls.deserialize_from(data)[0]
+
+    @classmethod
+    def _fixed_format(cls):
+        return cls._get_format(cls.size_in_bytes)
+
+    @classmethod
+    def _from_raw(cls, raw):
+        return cls.from_value(raw)
+
+    @classmethod
+    def _plain_from_raw(cls, raw):
+        if raw in cls._members:
+            return raw
+        raise ValueError(f"Valore {raw} non valido per {cls.__name__}")
 
     def to_dict(self):
         return self.symbols.get(self, int(self))
@@ -57,4 +117,4 @@ class REnum(int, RSerializable):
         return f"{self.__class__.__name__}({self.to_dict()}, size={self.size_in_bytes}, byte_order='{self.byte_order}')"
 
     def default(self):
-        return self.symbols[list(self.values.values())[0]]
\ No newline at end of file
+        return self.symbols[self._default]
\ No newline at end of file
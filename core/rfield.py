@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+from .rlist import RList
+
+
+def _skip_fields(fields, buffer, offset: int) -> int:
+    # Walk (name, type) fields without decoding them, except the ones used as list lengths
+    lengths = SimpleNamespace()
+    length_fields = {field_type.length_field for _, field_type in fields if issubclass(field_type, RList)}
+    for field, field_type in fields:
+        if field in length_fields:
+            value, offset = field_type.deserialize_from(buffer, offset)
+            setattr(lengths, field, value)
+        else:
+            offset = field_type._skip(buffer, offset, lengths)
+    return offset
+
+
+class RField:
+    """
+    A fixed-size field of an RComposite/RMessage addressed by dotted path ("header.seq", "sensor.id"),
+    read or overwritten in place inside a serialized message (bytearray, memoryview, mmap...).
+    Its offset is resolved once per class; only when variable-size fields precede it the offset
+    is computed from the buffer, reading list lengths and union tags but no other data.
+    """
+
+    def __init__(self, serializable_type, path: str):
+        self.serializable_type = serializable_type
+        self.path = path
+        self._levels = []  # (static offset, fields to skip before it or None) per struct level
+        struct_type, unboxed = serializable_type, False
+        for part in path.split("."):
+            if not hasattr(struct_type, "_wire_fields"):
+                raise ValueError(f"Campo {path} non valido: {struct_type.__name__} non è un composite")
+            fields = struct_type._wire_fields()
+            names = [field for field, _ in fields]
+            if part not in names:
+                raise ValueError(f"Campo {part} non presente in {struct_type.__name__}")
+            index = names.index(part)
+            sizes = [field_type.static_size() for _, field_type in fields[:index]]
+            if None in sizes:
+                self._levels.append((0, fields[:index]))
+            else:
+                self._levels.append((sum(sizes), None))
+            unboxed = getattr(struct_type, "unboxed", False)
+            struct_type = fields[index][1]
+        self.field_type = struct_type
+        self.unboxed = unboxed
+        self.codec = struct_type._compiled_struct()
+        if self.codec is None:
+            raise ValueError(f"Campo {path} a dimensione variabile: non si può modificare sul posto")
+        # Offset statico se nessun campo a dimensione variabile precede il campo
+        self.static_offset = sum(rel for rel, _ in self._levels) if all(skip is None for _, skip in self._levels) else None
+
+    @classmethod
+    def of(cls, serializable_type, path: str):
+        """Field of serializable_type at path, resolved on first use."""
+        cache = serializable_type.__dict__.get("_field_cache")
+        if cache is None or cache[0] != serializable_type.byte_order:
+            cache = (serializable_type.byte_order, {})
+            serializable_type._field_cache = cache
+        field = cache[1].get(path)
+        if field is None:
+            field = cache[1][path] = cls(serializable_type, path)
+        return field
+
+    def offset_in(self, buffer, offset: int = 0) -> int:
+        """Absolute offset of the field in a message serialized at offset."""
+        if self.static_offset is not None:
+            return offset + self.static_offset
+        for rel, skip in self._levels:
+            offset = _skip_fields(skip, buffer, offset) if skip is not None else offset + rel
+        return offset
+
+    def get(self, buffer, offset: int = 0):
+        values = self.codec.unpack_from(buffer, self.offset_in(buffer, offset))
+        if self.unboxed:
+            return self.field_type._unpack_unboxed(values, 0)[0]
+        return self.field_type._unpack_values(values, 0)[0]
+
+    def set(self, buffer, value, offset: int = 0):
+        if not isinstance(value, self.field_type):
+            value = self.field_type.from_dict(value)
+        values = []
+        value._pack_values(values)
+        self.codec.pack_into(buffer, self.offset_in(buffer, offset), *values)
+
@@ -2,14 +2,14 @@ import struct
 from .rserializable import RSerializable
 
 class RFloat(float, RSerializable):
+    __slots__ = ()
+    size = 4
+    _plain_type = float
 
-    def __new__(cls, value=0.0, size=4):
-        obj = super().__new__(cls, value)
-        obj.size = size
-        return obj
-
-    def __init__(self, value=0.0):
-        self.value = float(value)
+    def __new__(cls, value=0.0, size=None):
+        if size is not None:
+            cls._check_class_arguments(size=size)
+        return super().__new__(cls, value)
 
     def serialize(self) -> bytearray:
         fmt = self._get_format(self.size)
@@ -17,9 +17,11 @@ class RFloat(float, RSerializable):
 
     @classmethod
     def deserialize(cls, data: bytearray):
-        fmt = cls._get_format(cls.size)
-        value = struct.unpack(f"{cls.byte_order}{fmt}", data[:cls.size])[0]
-        return cls(value)
+        return cls.deserialize_from(data)[0]
+
+    @classmethod
+    def _fixed_format(cls):
+        return cls._get_format(cls.size)
 
     def to_dict(self):
         return float(self)
@@ -40,11 +42,11 @@ class RFloat(float, RSerializable):
 
 # Classi derivate con dimensioni fisse
 class RFloat32(RFloat):
+    __slots__ = ()
+    __new__ = float.__new__  # solo il valore, senza l'argomento deprecato di RFloat
     size = 4
-    def __new__(cls, value=0.0):
-        return super().__new__(cls, cls.size)
 
 class RFloat64(RFloat):
+    __slots__ = ()
+    __new__ = float.__new__
     size = 8
-    def __new__(cls, value=0.0):
-        return super().__new__(cls, cls.size)
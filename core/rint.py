@@ -2,11 +2,15 @@ import struct
 from .rserializable import RSerializable
 
 class RInt(int, RSerializable):
-    def __new__(cls, value=0, size=4, signed=True):
-        obj = super().__new__(cls, value)
-        obj.size = size
-        obj.signed = signed
-        return obj
+    __slots__ = ()
+    size = 4
+    signed = True
+    _plain_type = int
+
+    def __new__(cls, value=0, size=None, signed=None):
+        if size is not None or signed is not None:
+            cls._check_class_arguments(size=size, signed=signed)
+        return super().__new__(cls, value)
 
     def serialize(self) -> bytearray:
         fmt = self._get_format(self.size, self.signed)
@@ -14,9 +18,11 @@ class RInt(int, RSerializable):
 
     @classmethod
     def deserialize(cls, data: bytearray):
-        fmt = cls._get_format(cls.size, cls.signed)
-        value = struct.unpack(f"{cls.byte_order}{fmt}", data[:cls.size])[0]
-        return cls(value)
+        return cls.deserialize_from(data)[0]
+
+    @classmethod
+    def _fixed_format(cls):
+        return cls._get_format(cls.size, cls.signed)
 
     def to_dict(self) -> int:
         return int(self)
@@ -43,50 +49,46 @@ class RInt(int, RSerializable):
 
 
 class RInt8(RInt):
+    __slots__ = ()
+    __new__ = int.__new__  # solo il valore, senza gli argomenti deprecati di RInt
     size = 1
     signed = True
-    def __new__(cls, value=0):
-        return super().__new__(cls, value, cls.size, cls.signed)
 
 class RInt16(RInt):
+    __slots__ = ()
+    __new__ = int.__new__
     size = 2
     signed = True
-    def __new__(cls, value=0):
-        return super().__new__(cls, value, cls.size, cls.signed)
 
 class RInt32(RInt):
+    __slots__ = ()
+    __new__ = int.__new__
     size = 4
     signed = True
-    def __new__(cls, value=0):
-        return super().__new__(cls, value, cls.size, cls.signed)
 
 class RInt64(RInt):
+    __slots__ = ()
+    __new__ = int.__new__
     size = 8
     signed = True
-    def __new__(cls, value=0):
-        return super().__new__(cls, value, cls.size, cls.signed)
 
 class RUint8(RInt):
+    __slots__ = ()
     size = 1
     signed = False
-    def __new__(cls, value=0):
-        return super().__new__(cls, value, cls.size, cls.signed)
 
 class RUint16(RInt):
+    __slots__ = ()
     size = 2
     signed = False
-    def __new__(cls, value=0):
-        return super().__new__(cls, value, cls.size, cls.signed)
 
 class RUint32(RInt):
+    __slots__ = ()
     size = 4
     signed = False
-    def __new__(cls, value=0):
-        return super().__new__(cls, value, cls.size, cls.signed)
 
 class RUint64(RInt):
+    __slots__ = ()
     size = 8
     signed = False
-    def __new__(cls, value=0):
-        return super().__new__(cls, value, cls.size, cls.signed)
 
@@ -1,13 +1,46 @@
 import json
+import struct
 import yaml
 import os
+import importlib
+import importlib.util
+import hashlib
+import marshal
+import sys
+from graphlib import TopologicalSorter
+from types import ModuleType, SimpleNamespace
+from .rserializable import RSerializable
+from .rint import RInt8, RInt16, RInt32, RInt64, RUint8, RUint16, RUint32, RUint64
+from .rfloat import RFloat32, RFloat64
+from .rstring import RString8, RString16, RString32, RString40, RString64, RString128, RString256
+from .rbool import RBool
+from .rmessage import RMessage
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class RISParser:
     struct_types = ['RMessage', 'RComposite', 'REnum', 'RList', 'RUnion']
-
-    def __init__(self, ris_schema: str = None):
+    section_types = {'messages': 'RMessage', 'composites': 'RComposite', 'arrays': 'RList',
+                     'enums': 'REnum', 'unions': 'RUnion'}
+    numpy_types = {
+        "int8": "i1", "int16": "i2", "int32": "i4", "int64": "i8",
+        "uint8": "u1", "uint16": "u2", "uint32": "u4", "uint64": "u8",
+        "float": "f4", "float32": "f4", "float64": "f8", "double": "f8",
+        "bool": "?",
+        "string8": "S8", "string16": "S16", "string32": "S32", "string40": "S40",
+        "string64": "S64", "string128": "S128", "string256": "S256",
+    }
+
+    def __init__(self, ris_schema: str = None, cache_dir: str = None):
         self.generator =  RISGenerator()
         self._ris_schema = None
+        self._dtypes = {}
+        self.cache_dir = cache_dir  # compiled-schema cache, see _load_cache
+        self._cache = None
+        self._cache_path = None
         if ris_schema:
             if ris_schema.endswith('json'):
                 self.load_from_json(ris_schema)
@@ -21,24 +54,210 @@ class RISParser:
     @ris_schema.setter
     def ris_schema(self, value):
         self._ris_schema = value
+        self._dtypes = {}
+        self._cache = None
+        self._cache_path = None
         self.generator.table_from_ris(value)
 
     def load_schema(self, schema: dict):
         self.ris_schema = schema
 
     def load_from_json(self, json_path: str):
-        with open(json_path, "r") as f:
-            self.ris_schema = json.load(f)
+        with open(json_path, "rb") as f:
+            content = f.read()
+        if not self._load_cache(content):
+            self.ris_schema = json.loads(content)
+            self._save_cache(content)
 
     def load_from_yaml(self, yaml_path: str):
-        with open(yaml_path, "r") as f:
-            self.ris_schema = yaml.safe_load(f)
-
-    def generate_classes(self):
-        # todo
-        pass
-
-    def generate_code(self, output_dir: str):
+        with open(yaml_path, "rb") as f:
+            content = f.read()
+        if not self._load_cache(content):
+            self.ris_schema = yaml.safe_load(content)
+            self._save_cache(content)
+
+    def _cache_file(self, content: bytes):
+        # Nome: versione della libreria (sorgenti e bytecode di Python) + hash del contenuto dello schema
+        key = hashlib.sha256(content).hexdigest()
+        return os.path.join(self.cache_dir, f"{library_version()[:16]}-{key}.ripc")
+
+    def _prune_cache(self):
+        # Voci di altre versioni della libreria: non verrebbero più lette
+        prefix = f"{library_version()[:16]}-"
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".ripc") and not name.startswith(prefix):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def _load_cache(self, content: bytes) -> bool:
+        """
+        Restore a schema compiled by a previous run. The parsed schema, struct table, type graph and
+        order are read as JSON; only the class code is marshalled, and it is loaded only if the entry
+        records the sha256 of this very schema and of the code it carries.
+        """
+        if self.cache_dir is None:
+            return False
+        path = self._cache_file(content)
+        try:
+            with open(path, "rb") as f:
+                header, blob = f.read().split(b"\n", 1)
+            cache = json.loads(header)
+        except Exception:
+            # Cache assente o illeggibile (file troncato, scrittura interrotta): si ricompila e si riscrive
+            return False
+        if (not isinstance(cache, dict) or cache.get("schema_digest") != hashlib.sha256(content).hexdigest()
+                or cache.get("code_digest") != hashlib.sha256(blob).hexdigest()):
+            return False
+        try:
+            code = marshal.loads(blob)
+            cache["code"] = {False: dict(code[False]), True: dict(code[True])}
+            cache["type_graph"] = {name: set(deps) for name, deps in cache["type_graph"].items()}
+        except Exception:
+            return False
+        self._ris_schema = cache["schema"]
+        self._dtypes = {}
+        self.generator._schema = cache["schema"]
+        self.generator._byte_order = get_byte_order(cache["schema"].get('metadata', {}))
+        self.generator.struct_table = cache["struct_table"]
+        self._cache, self._cache_path = cache, path
+        return True
+
+    def _save_cache(self, content: bytes = None):
+        if self.cache_dir is None:
+            return
+        if self._cache is None:
+            # Schema non rappresentabile in JSON (es. chiavi non stringa): nessuna cache
+            if json.loads(json.dumps(self.ris_schema, default=str)) != self.ris_schema:
+                return
+            graph = self.type_graph()
+            self._cache = {"schema": self.ris_schema, "struct_table": self.generator.struct_table,
+                           "type_graph": graph, "order": list(TopologicalSorter(graph).static_order()),
+                           "schema_digest": hashlib.sha256(content).hexdigest(),
+                           "code": {False: {}, True: {}}}
+            self._cache_path = self._cache_file(content)
+        # Riga JSON con i dati, poi il solo codice delle classi in marshal
+        blob = marshal.dumps(self._cache["code"])
+        header = {key: value for key, value in self._cache.items() if key != "code"}
+        header["type_graph"] = {name: sorted(deps) for name, deps in header["type_graph"].items()}
+        header["code_digest"] = hashlib.sha256(blob).hexdigest()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n" + blob)
+        os.replace(tmp_path, self._cache_path)
+        self._prune_cache()
+
+    def numpy_dtype(self, struct_name: str):
+        """Structured dtype matching the wire layout of a fixed-size structure."""
+        if np is None:
+            raise ImportError("numpy is required to build structured dtypes.")
+        if struct_name not in self._dtypes:
+            self._dtypes[struct_name] = self._build_dtype(struct_name)
+        return self._dtypes[struct_name]
+
+    def decode_batch(self, struct_name: str, data, count: int = None, offset: int = 0):
+        """Decode back-to-back records of one structure into a structured array (a view on data)."""
+        dtype = self.numpy_dtype(struct_name)
+        if count is None:
+            count = (len(data) - offset) // dtype.itemsize
+        return np.frombuffer(data, dtype, count=count, offset=offset)
+
+    def _build_dtype(self, type_name):
+        byte_order = get_byte_order(self.ris_schema.get('metadata', {}))
+        if isinstance(type_name, str) and (code := self.numpy_types.get(type_name.lower())) is not None:
+            return np.dtype(code if code.startswith('S') else byte_order + code)
+        section = self.generator.struct_table.get(type_name)
+        struct_def = self.ris_schema.get(section, {}).get(type_name)
+        if section == 'enums':
+            return np.dtype(f"{byte_order}u{struct_def.get('size_in_bytes', 4)}")
+        if section == 'arrays' and isinstance(struct_def.get('length_field'), int):
+            return np.dtype((self.numpy_dtype(struct_def['element_type']), (struct_def['length_field'],)))
+        if section in ('composites', 'messages'):
+            fields = [('header', self.numpy_dtype('Header'))] if section == 'messages' else []
+            fields += [(name, self.numpy_dtype(field_type)) for name, field_type in struct_def.get('fields', {}).items()]
+            return np.dtype(fields)
+        raise ValueError(f"{type_name} non ha un layout fisso e non può essere mappato su un dtype numpy")
+
+    def type_graph(self) -> dict:
+        """Dependencies of every structure: {struct_name: {names of the structures it uses}}."""
+        if self._cache:
+            return self._cache["type_graph"]
+        sections = {section: self.ris_schema.get(section, {}) for section in self.section_types}
+        known = {name for structs in sections.values() for name in structs}
+        graph = {}
+        for section, structs in sections.items():
+            for struct_name, struct_def in structs.items():
+                if section == 'messages':
+                    uses = ['Header', *struct_def.get('fields', {}).values()]
+                elif section == 'composites':
+                    uses = struct_def.get('fields', {}).values()
+                elif section == 'arrays':
+                    uses = [struct_def['element_type']]
+                elif section == 'unions':
+                    uses = struct_def['possible_types'].values()
+                else:
+                    uses = []
+                graph[struct_name] = {name for name in uses if name in known}
+        return graph
+
+    def class_metadata(self) -> dict:
+        """Byte order and sizes of the schema metadata, as attributes of the classes built by generate_classes."""
+        metadata = self.ris_schema.get('metadata', {})
+        return {"byte_order": get_byte_order(metadata),
+                "enum_size_in_bytes": metadata.get('enum_size_in_bytes', RSerializable.enum_size),
+                "list_length_field_size": metadata.get('list_length_field_size', RSerializable.list_length_field_size)}
+
+    def generate_classes(self, specialized: bool = False, module: str = None):
+        """
+        Build all the schema classes in memory; returns (namespace, {message id: message class}).
+        With module the classes are also registered in sys.modules under that name, so that
+        their instances can be pickled (e.g. sent between processes that generated the same classes).
+        The schema metadata is set on the generated classes, not on RSerializable: schemas with a
+        different byte order can be loaded in the same process.
+        """
+        self.generator.specialized = specialized
+        metadata = self.class_metadata()
+        core = importlib.import_module(__package__)
+        namespace = {name: value for name, value in vars(core).items() if not name.startswith('_')}
+        namespace.update(__name__=module or f"{__package__}.ris_classes", struct=struct)
+        # Tipi primitivi propri dello schema: sottoclassi con il suo byte order, quelli di rip.core restano invariati
+        primitives = {name: type(name, (base,), {"__slots__": (), "__module__": namespace["__name__"], **metadata})
+                      for name, base in self.generator.primitive_types.items()}
+        namespace.update(primitives)
+
+        sections = {struct_name: section for section in self.section_types
+                    for struct_name in self.ris_schema.get(section, {})}
+        order = self._cache["order"] if self._cache else TopologicalSorter(self.type_graph()).static_order()
+        compiled = self._cache["code"][specialized] if self._cache else {}
+        new_code = False
+        classes = {}
+        for struct_name in order:
+            code = compiled.get(struct_name)
+            if code is None:
+                section = sections[struct_name]
+                source = self.generator.generate_class_code(struct_name, self.ris_schema[section][struct_name],
+                                                            parent=self.section_types[section])
+                code = compiled[struct_name] = marshal.dumps(compile(source, f"<ris:{struct_name}>", "exec"))
+                new_code = True
+            exec(marshal.loads(code), namespace)
+            cls = classes[struct_name] = namespace[struct_name]
+            for name, value in metadata.items():
+                setattr(cls, name, value)
+        if new_code and self._cache:
+            self._save_cache()
+
+        for cls in classes.values():
+            cls._compiled_struct()
+        message_map = {cls.id: cls for cls in classes.values() if issubclass(cls, RMessage)}
+        if module:
+            sys.modules[module] = ModuleType(module)
+            vars(sys.modules[module]).update(primitives, **classes)
+        return SimpleNamespace(**classes), message_map
+
+    def generate_code(self, output_dir: str, specialized: bool = False):
+        self.generator.specialized = specialized
         for struct_type in self.struct_types:
             os.makedirs(os.path.join(output_dir, self.generator.get_folder(struct_type)), exist_ok=True)
 
@@ -56,12 +275,71 @@ class RISParser:
         self.generator.generate_init(output_dir=output_dir, metadata=self.ris_schema['metadata'])
 
 
-class RISGenerator:
+def library_version() -> str:
+    """Digest of this package's sources and of the bytecode format, used to key compiled-schema caches."""
+    global _library_version
+    if _library_version is None:
+        digest = hashlib.sha256(importlib.util.MAGIC_NUMBER)
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(package_dir)):
+            if name.endswith(".py"):
+                with open(os.path.join(package_dir, name), "rb") as f:
+                    digest.update(name.encode() + f.read())
+        _library_version = digest.hexdigest()
+    return _library_version
+
+_library_version = None
+
+
+def get_byte_order(metadata: dict) -> str:
+    """Struct byte order ('<' or '>') from the RIS metadata ('<', '>', 'little' or 'big')."""
+    byte_order = str(metadata.get('byte_order', '<')).lower()
+    return '>' if byte_order == '>' or 'big' in byte_order else '<'
 
-    def __init__(self):
+
+class RISGenerator:
+    type_mapping = {
+        'double': "RFloat64",
+        "int8": "RInt8",
+        "int16": "RInt16",
+        "int32": "RInt32",
+        "int64": "RInt64",
+        "uint8": "RUint8",
+        "uint16": "RUint16",
+        "uint32": "RUint32",
+        "uint64": "RUint64",
+        "float": "RFloat32",
+        "float32": "RFloat32",
+        "float64": "RFloat64",
+        "string8": "RString8",
+        "string16": "RString16",
+        "string32": "RString32",
+        "string40": "RString40",
+        "string64": "RString64",
+        "string128": "RString128",
+        "string256": "RString256",
+        "bool": "RBool",
+        "list": "RList",
+        "composite": "RComposite",
+        "enum": "REnum",
+        "union": "RUnion",
+        "message": "RMessage",
+    }
+    primitive_types = {cls.__name__: cls for cls in (
+        RInt8, RInt16, RInt32, RInt64, RUint8, RUint16, RUint32, RUint64, RFloat32, RFloat64,
+        RString8, RString16, RString32, RString40, RString64, RString128, RString256, RBool)}
+    section_kinds = {'enums': 'enum', 'composites': 'composite', 'messages': 'composite',
+                     'arrays': 'array', 'unions': 'union'}
+
+    def __init__(self, specialized: bool = False):
         self._struct_table = None
         self._import_code = set()
         self._message_map = set()
+        self._schema = {}
+        self._byte_order = '<'
+        self._codec_vars = 0
+        # Emette anche serialize_into/deserialize_from/to_dict/from_dict specializzati
+        self.specialized = specialized
 
     @property
     def struct_table(self):
@@ -77,6 +355,8 @@ class RISGenerator:
         return struct_type[1:].lower() + 's'
 
     def table_from_ris(self, schema):
+        self._schema = schema
+        self._byte_order = get_byte_order(schema.get('metadata', {}))
         self.struct_table = {struct_name: struct_type
                              for struct_type, struct in schema.items()
                              for struct_name in struct}
@@ -87,13 +367,21 @@ class RISGenerator:
 
     def generate_structure(self, struct_name, struct_def, parent, output_dir=None):
         self.reset_import_code()
-        code = '\n\n' + getattr(self, f'generate_{parent}')(struct_name, struct_def)
+        code = '\n\n' + self.generate_class_code(struct_name, struct_def, parent)
         code = "\n".join(list(self._import_code)) + code
         if output_dir:
             with open(os.path.join(output_dir, f'{self.get_folder(parent)}/{struct_name}.py'), 'w') as file:
                 file.write(code)
         return code
 
+    def generate_class_code(self, struct_name, struct_def, parent):
+        code = getattr(self, f'generate_{parent}')(struct_name, struct_def)
+        if self.specialized and parent != 'REnum':
+            self._import_code.add("import struct")
+            self._codec_vars = 0
+            code += getattr(self, f'generate_codec_{parent}')(struct_name, struct_def)
+        return code
+
     def generate_RMessage(self, struct_name, struct_def):
         self._message_map.add((struct_def['id'], struct_name))
         self._import_code.add(f"from ..{self.get_folder('RComposite')}.Header import Header")
@@ -102,6 +390,8 @@ class RISGenerator:
         class_code += f"    source = {struct_def['source']}\n"
         class_code += f"    dest = {struct_def['dest']}\n"
         class_code += f"    header = Header()\n"
+        if struct_def.get("unboxed", False):
+            class_code += "    unboxed = True\n"
         for field_name, field_info in struct_def.get("fields", {}).items():
             field_type = self._map_type(field_info)
             class_code += f"    {field_name}: {field_type}\n"
@@ -109,6 +399,8 @@ class RISGenerator:
 
     def generate_RComposite(self, struct_name, struct_def):
         class_code = f"class {struct_name}(RComposite):\n"
+        if struct_def.get("unboxed", False):
+            class_code += "    unboxed = True\n"
         for field_name, field_info in struct_def.get("fields", {}).items():
             field_type = self._map_type(field_info)
             class_code += f"    {field_name}: {field_type}\n"
@@ -122,10 +414,13 @@ class RISGenerator:
         if length_field:
             class_code += (f"    length_field = " +
                 (f"{length_field}\n" if isinstance(length_field, int) else f"'{length_field}'\n"))
+        if struct_def.get("array_backed", False):
+            class_code += "    array_backed = True\n"
         return class_code
 
     def generate_REnum(self, struct_name, struct_def):
         class_code = f"class {struct_name}(REnum):\n"
+        class_code += "    __slots__ = ()\n"
         size_in_bytes = struct_def.get("size_in_bytes", 4)
         class_code += f"    size_in_bytes = {size_in_bytes}\n"
         class_code += "    values: dict = {\n"
@@ -146,14 +441,17 @@ class RISGenerator:
     def generate_init(self, output_dir=None, metadata=None):
         # Generazione dell'__init__.py
         metadata = metadata or {}
-        code = "from rip.core.rserializable import RSerializable\n"
+        code = "import struct\n"
+        code += "from rip.core.rserializable import RSerializable\n"
+        code += "from rip.core.rtranscoder import RTranscoder\n"
         code += "from .composites.Header import Header\n"
         message_map = dict(self._message_map)
         for message_name in message_map.values():
             code += f"from .messages.{message_name} import {message_name}\n"
         code += "\n"
-        code += f"BYTE_ORDER = '{'big' if 'big' in metadata['byte_order'].lower() else 'little'}'\n"
-        code += f"RSerializable.byte_order = '{'>' if 'big' in metadata['byte_order'].lower() else '<'}'\n"
+        byte_order = get_byte_order(metadata)
+        code += f"BYTE_ORDER = '{'big' if byte_order == '>' else 'little'}'\n"
+        code += f"RSerializable.byte_order = '{byte_order}'\n"
         code += f"RSerializable.enum_size_in_bytes = {metadata['enum_size_in_bytes']}\n"
         code += f"RSerializable.list_length_field_size = {metadata['list_length_field_size']}\n"
         code += "\nmessage_map = {\n"
@@ -161,12 +459,36 @@ class RISGenerator:
             code += f"   {message_id}:{message_name},\n"
         code += "}\n\n"
 
-        code += "def deserialize(data: bytearray, to_dict=False):\n"
-        code += "     header = Header.deserialize(data[:Header().size_in_bytes()])\n"
-        code += "     message = message_map[header.id].deserialize(data)\n"
+        code += self._generate_header_peek(byte_order)
+        code += "\n\ndef _accepted(data, offset, message_id, allow, deny, predicate):\n"
+        code += "     if allow is not None and message_id not in allow:\n"
+        code += "         return False\n"
+        code += "     if deny is not None and message_id in deny:\n"
+        code += "         return False\n"
+        code += "     return predicate is None or predicate(Header.deserialize_from(data, offset)[0])\n"
+        code += "\n\ndef deserialize(data: bytearray, to_dict=False, allow=None, deny=None, predicate=None):\n"
+        code += "     \"\"\"Decode the frame at the start of data; None if it is rejected by allow/deny/predicate(header).\"\"\"\n"
+        code += "     message_id, _ = _peek(data, 0)\n"
+        code += "     if not _accepted(data, 0, message_id, allow, deny, predicate):\n"
+        code += "         return None\n"
         code += "     if to_dict:\n"
-        code += "         message = message.to_dict()\n"
-        code += "     return message\n"
+        code += "         return RTranscoder.of(message_map[message_id]).decode(data)\n"
+        code += "     return message_map[message_id].deserialize(data)\n"
+        code += "\n\ndef deserialize_frames(data: bytearray, to_dict=False, allow=None, deny=None, predicate=None):\n"
+        code += "     \"\"\"Decode the frames concatenated in data; rejected frames are skipped without being decoded.\"\"\"\n"
+        code += "     view = memoryview(data)\n"
+        code += "     offset = 0\n"
+        code += "     while offset < len(view):\n"
+        code += "         message_id, length = _peek(view, offset)\n"
+        code += "         if length < HEADER_SIZE:\n"
+        code += "             raise ValueError(f\"Lunghezza del frame non valida: {length}\")\n"
+        code += "         if _accepted(view, offset, message_id, allow, deny, predicate):\n"
+        code += "             frame = view[offset:offset + length]\n"
+        code += "             if to_dict:\n"
+        code += "                 yield RTranscoder.of(message_map[message_id]).decode_from(frame)[0]\n"
+        code += "             else:\n"
+        code += "                 yield message_map[message_id].deserialize_from(frame)[0]\n"
+        code += "         offset += length\n"
 
         if output_dir:
             with open(os.path.join(output_dir, f'__init__.py'), 'w') as file:
@@ -176,39 +498,363 @@ class RISGenerator:
 
 
 
+    def _generate_header_peek(self, byte_order):
+        # _peek(data, offset) -> (id, length): a single unpack_from when the Header has a fixed layout
+        header_fields = self._struct_def("Header").get("fields", {})
+        fmt = ""
+        names = []
+        for field, field_type in header_fields.items():
+            field_format = self._field_format(field_type)
+            if field_format is None:
+                break
+            if field in ("id", "length"):
+                fmt += field_format
+                names.append("message_id" if field == "id" else field)
+            else:
+                fmt += f"{struct.calcsize(byte_order + field_format)}x"
+        else:
+            if sorted(names) == ["length", "message_id"]:
+                code = f"HEADER_SIZE = {struct.calcsize(byte_order + fmt)}\n"
+                code += f"_header_struct = struct.Struct('{byte_order}{fmt}')\n"
+                code += "\n\ndef _peek(data, offset):\n"
+                if names[0] == "message_id":
+                    code += "     return _header_struct.unpack_from(data, offset)\n"
+                else:
+                    code += "     length, message_id = _header_struct.unpack_from(data, offset)\n"
+                    code += "     return message_id, length\n"
+                return code
+        code = "HEADER_SIZE = Header.static_size()\n"
+        code += "\n\ndef _peek(data, offset):\n"
+        code += "     header, _ = Header.deserialize_from(data, offset)\n"
+        code += "     return header.id, header.length\n"
+        return code
+
     def _map_type(self, field_info):
         """Mappa i tipi di RIS sui tipi Python appropriati."""
-        type_mapping = {
-            'double': "RFloat64",
-            "int8": "RInt8",
-            "int16": "RInt16",
-            "int32": "RInt32",
-            "int64": "RInt64",
-            "uint8": "RUint8",
-            "uint16": "RUint16",
-            "uint32": "RUint32",
-            "uint64": "RUint64",
-            "float": "RFloat32",
-            "float32": "RFloat32",
-            "float64": "RFloat64",
-            "string8": "RString8",
-            "string16": "RString16",
-            "string32": "RString32",
-            "string40": "RString40",
-            "string64": "RString64",
-            "string128": "RString128",
-            "string256": "RString256",
-            "bool": "RBool",
-            "list": "RList",
-            "composite": "RComposite",
-            "enum": "REnum",
-            "union": "RUnion",
-            "message": "RMessage",
-        }
-
         if isinstance(field_info, int) or isinstance(field_info, float):
             return field_info
-        if (res := type_mapping.get(field_info.lower())) is not None:
+        if (res := self.type_mapping.get(field_info.lower())) is not None:
             return res
         self._import_code.add(f"from ..{self.struct_table[field_info]}.{field_info} import {field_info}")
         return field_info
+
+    # Codec specializzati (specialized=True)
+
+    def generate_codec_RComposite(self, struct_name, struct_def):
+        fields = list(struct_def.get("fields", {}).items())
+        code = self._generate_codec_fields(fields, unboxed=struct_def.get("unboxed", False))
+        if (size := self._struct_size(struct_name)) is not None:
+            code += "\n    def size_in_bytes(self) -> int:\n"
+            code += f"        return {size}\n"
+        return code
+
+    def generate_codec_RMessage(self, struct_name, struct_def):
+        fields = [("header", "Header")] + list(struct_def.get("fields", {}).items())
+        header_fields = self._struct_def("Header").get("fields", {})
+        header_unboxed = self._struct_def("Header").get("unboxed", False)
+        header_size = self._struct_size("Header")
+        total_size = self._struct_size(None, fields)
+        length = str(total_size) if total_size is not None else f"{header_size} + self.size_in_bytes()"
+        if self._field_format("Header") is not None:
+            # id e length vengono scritti direttamente, senza modificare il Header condiviso
+            prelude = [f"header_id = {self._from_dict_value(header_fields['id'], str(struct_def['id']), header_unboxed)}",
+                       f"header_length = {self._from_dict_value(header_fields['length'], length, header_unboxed)}"]
+            replace = {"self.header.id": "header_id", "self.header.length": "header_length"}
+        else:
+            prelude = [f"header = self._stamped_header({length})"]
+            replace = {"self.header": "header"}
+        code = self._generate_codec_fields(fields, prelude, exclude_from_dict=("header",),
+                                           unboxed=struct_def.get("unboxed", False), replace=replace,
+                                           from_dict_prelude=["obj.header = cls.header._copy()"])
+        if total_size is not None:
+            code += "\n    def size_in_bytes(self) -> int:\n"
+            code += f"        return {total_size - header_size}\n"
+        return code
+
+    def generate_codec_RList(self, struct_name, struct_def):
+        element = struct_def["element_type"]
+        length_field = struct_def.get("length_field", None)
+        if struct_def.get("array_backed", False) or length_field is None:
+            return ""
+        element_kind = self._kind(element)
+        element_format = self._field_format(element)
+        element_name = self._map_type(element)
+        count = str(length_field) if isinstance(length_field, int) else f"obj_ref.{length_field}"
+        code = ""
+        if element_format is not None:
+            element_size = struct.calcsize(self._byte_order + element_format)
+            if element_kind in ('primitive', 'enum'):
+                code += f"    _element_codec = struct.Struct('{self._byte_order}{element_format}')\n"
+
+        code += "\n    @classmethod\n"
+        code += "    def deserialize_from(cls, buffer, offset: int = 0, obj_ref=None):\n"
+        code += f"        count = {count}\n"
+        code += "        obj = cls.__new__(cls)\n"
+        if element_format is not None:
+            code += f"        end = offset + count * {element_size}\n"
+            code += "        if end > len(buffer):\n"
+            code += "            raise struct.error(f\"unpack requires a buffer of {end - offset} bytes\")\n"
+            if element_kind == 'enum':
+                code += f"        obj.items = {element_name}.from_values(struct.unpack_from(f\"{self._byte_order}{{int(count)}}{element_format}\", buffer, offset))\n"
+            elif element_kind == 'primitive':
+                code += f"        obj.items = [{self._wrap_raw(element, 'x')} for x, in cls._element_codec.iter_unpack(buffer[offset:end])]\n"
+            else:
+                code += f"        obj.items = [{element_name}.deserialize_from(buffer, offset + i * {element_size})[0] for i in range(count)]\n"
+            code += "        return obj, end\n"
+        else:
+            code += "        items = []\n"
+            code += "        for _ in range(count):\n"
+            code += f"            item, offset = {element_name}.deserialize_from(buffer, offset)\n"
+            code += "            items.append(item)\n"
+            code += "        obj.items = items\n"
+            code += "        return obj, offset\n"
+
+        code += "\n    def serialize_into(self, buffer, offset: int = 0) -> int:\n"
+        if isinstance(length_field, int):
+            code += f"        if len(self.items) != {length_field}:\n"
+            code += f"            raise ValueError(f\"{{self.__class__.__name__}} expects {length_field} elements, got {{len(self.items)}}\")\n"
+        if element_format is not None and element_kind in ('primitive', 'enum') and not element_format.endswith('s'):
+            code += f"        struct.pack_into(f\"{self._byte_order}{{len(self.items)}}{element_format}\", buffer, offset, *self.items)\n"
+            code += f"        return offset + len(self.items) * {element_size}\n"
+        elif element_format is not None and element_kind == 'primitive':
+            code += "        for item in self.items:\n"
+            code += "            self._element_codec.pack_into(buffer, offset, item.encode('utf-8'))\n"
+            code += f"            offset += {element_size}\n"
+            code += "        return offset\n"
+        else:
+            code += "        for item in self.items:\n"
+            code += "            offset = item.serialize_into(buffer, offset)\n"
+            code += "        return offset\n"
+
+        code += "\n    def to_dict(self) -> list:\n"
+        code += f"        return [{self._to_dict_value(element, 'item')} for item in self.items]\n"
+        code += "\n    @classmethod\n"
+        code += "    def from_dict(cls, items):\n"
+        code += f"        return cls([{self._from_dict_value(element, 'item')} for item in items])\n"
+        return code
+
+    def generate_codec_RUnion(self, struct_name, struct_def):
+        tag_size = 1
+        code = f"    _tag_codec = struct.Struct('{self._byte_order}{RSerializable._get_format(tag_size)}')\n"
+        code += "    _tags = {" + ", ".join(f"'{name}': {tag}" for tag, name in enumerate(struct_def["possible_types"])) + "}\n"
+        for tag, variant in enumerate(struct_def["possible_types"].values()):
+            if self._kind(variant) in ('primitive', 'enum'):
+                code += f"    _variant_codec_{tag} = struct.Struct('{self._byte_order}{self._field_format(variant)}')\n"
+
+        code += "\n    @classmethod\n"
+        code += "    def deserialize_from(cls, buffer, offset: int = 0):\n"
+        code += "        tag, = cls._tag_codec.unpack_from(buffer, offset)\n"
+        code += f"        offset += {tag_size}\n"
+        code += "        obj = cls.__new__(cls)\n"
+        for tag, (name, variant) in enumerate(struct_def["possible_types"].items()):
+            code += f"        {'if' if tag == 0 else 'elif'} tag == {tag}:\n"
+            code += f"            obj.selected_type = '{name}'\n"
+            if self._kind(variant) in ('primitive', 'enum'):
+                code += f"            x, = cls._variant_codec_{tag}.unpack_from(buffer, offset)\n"
+                code += f"            obj.value = {self._wrap_raw(variant, 'x')}\n"
+                code += f"            offset += cls._variant_codec_{tag}.size\n"
+            else:
+                code += f"            obj.value, offset = {self._map_type(variant)}.deserialize_from(buffer, offset)\n"
+        code += "        else:\n"
+        code += "            raise ValueError(f\"Tag {tag} non valido per {cls.__name__}\")\n"
+        code += "        return obj, offset\n"
+
+        code += "\n    def serialize_into(self, buffer, offset: int = 0) -> int:\n"
+        code += "        self._tag_codec.pack_into(buffer, offset, self._tags[self.selected_type])\n"
+        code += f"        return self.value.serialize_into(buffer, offset + {tag_size})\n"
+        return code
+
+    def _generate_codec_fields(self, fields, prelude=(), exclude_from_dict=(), unboxed=False, replace=None,
+                               from_dict_prelude=()):
+        segments = self._codec_segments(fields)
+        code = ""
+        for index, segment in enumerate(segments):
+            if segment[0] == 'fixed':
+                code += f"    _codec_{index} = struct.Struct('{self._byte_order}{segment[2]}')\n"
+
+        code += "\n    @classmethod\n"
+        code += "    def deserialize_from(cls, buffer, offset: int = 0):\n"
+        code += "        obj = cls.__new__(cls)\n"
+        for index, segment in enumerate(segments):
+            if segment[0] == 'fixed':
+                lines = []
+                item = 0
+                for field, field_type in segment[1]:
+                    item = self._codec_unpack(field_type, f"obj.{field}", item, lines, unboxed)
+                code += f"        v = cls._codec_{index}.unpack_from(buffer, offset)\n"
+                code += "".join(f"        {line}\n" for line in lines)
+                code += f"        offset += {struct.calcsize(self._byte_order + segment[2])}\n"
+            else:
+                field, field_type = segment[1]
+                ref = ", obj" if self._kind(field_type) == 'array' else ""
+                code += f"        obj.{field}, offset = {self._map_type(field_type)}.deserialize_from(buffer, offset{ref})\n"
+        code += "        return obj, offset\n"
+
+        code += "\n    def serialize_into(self, buffer, offset: int = 0) -> int:\n"
+        code += "".join(f"        {line}\n" for line in prelude)
+        for index, segment in enumerate(segments):
+            if segment[0] == 'fixed':
+                lines, values = [], []
+                for field, field_type in segment[1]:
+                    self._codec_pack(field_type, f"self.{field}", values, lines)
+                values = [(replace or {}).get(value, value) for value in values]
+                code += "".join(f"        {line}\n" for line in lines)
+                code += f"        self._codec_{index}.pack_into(buffer, offset, {', '.join(values)})\n"
+                code += f"        offset += {struct.calcsize(self._byte_order + segment[2])}\n"
+            else:
+                target = (replace or {}).get(f"self.{segment[1][0]}", f"self.{segment[1][0]}")
+                code += f"        offset = {target}.serialize_into(buffer, offset)\n"
+        code += "        return offset\n"
+
+        dict_fields = [(field, field_type) for field, field_type in fields if field not in exclude_from_dict]
+        code += "\n    def to_dict(self) -> dict:\n"
+        code += "        return {\n"
+        code += "".join(f"            '{field}': {self._to_dict_value(field_type, f'self.{field}', unboxed)},\n"
+                        for field, field_type in dict_fields)
+        code += "        }\n"
+        code += "\n    @classmethod\n"
+        code += "    def from_dict(cls, data):\n"
+        code += "        obj = cls.__new__(cls)\n"
+        code += "".join(f"        {line}\n" for line in from_dict_prelude)
+        code += "".join(f"        obj.{field} = {self._from_dict_value(field_type, f'data[{field!r}]', unboxed)}\n"
+                        for field, field_type in dict_fields)
+        code += "        return obj\n"
+        return code
+
+    def _codec_segments(self, fields):
+        # Raggruppa i campi consecutivi a dimensione fissa in un unico Struct
+        segments, run, run_format = [], [], ""
+        for field, field_type in fields:
+            field_format = self._field_format(field_type)
+            if field_format is None:
+                if run:
+                    segments.append(('fixed', run, run_format))
+                    run, run_format = [], ""
+                segments.append(('variable', (field, field_type)))
+            else:
+                run.append((field, field_type))
+                run_format += field_format
+        if run:
+            segments.append(('fixed', run, run_format))
+        return segments
+
+    def _codec_unpack(self, type_name, target, index, lines, unboxed=False):
+        kind = self._kind(type_name)
+        if kind in ('primitive', 'enum'):
+            lines.append(f"{target} = {self._wrap_raw(type_name, f'v[{index}]', unboxed)}")
+            return index + 1
+        name = self._map_type(type_name)
+        struct_def = self._struct_def(type_name)
+        if kind == 'array':
+            element, length = struct_def["element_type"], struct_def["length_field"]
+            if self._kind(element) == 'primitive':
+                lines.append(f"{target} = {name}.__new__({name})")
+                lines.append(f"{target}.items = [{self._wrap_raw(element, 'x')} for x in v[{index}:{index + length}]]")
+            else:
+                lines.append(f"{target}, _ = {name}._unpack_values(v, {index})")
+            return index + self._item_count(type_name)
+        var = self._new_codec_var()
+        lines.append(f"{var} = {name}.__new__({name})")
+        for field, field_type in struct_def.get("fields", {}).items():
+            index = self._codec_unpack(field_type, f"{var}.{field}", index, lines, struct_def.get("unboxed", False))
+        lines.append(f"{target} = {var}")
+        return index
+
+    def _codec_pack(self, type_name, expr, values, lines):
+        kind = self._kind(type_name)
+        if kind == 'primitive':
+            values.append(f"{expr}.encode('utf-8')" if self._field_format(type_name).endswith('s') else expr)
+        elif kind == 'enum':
+            values.append(expr)
+        elif kind == 'array':
+            struct_def = self._struct_def(type_name)
+            element = struct_def["element_type"]
+            if self._kind(element) in ('primitive', 'enum') and not self._field_format(element).endswith('s'):
+                length = struct_def["length_field"]
+                lines.append(f"if len({expr}.items) != {length}:")
+                lines.append(f"    raise ValueError(f\"{{{expr}.__class__.__name__}} expects {length} elements, got {{len({expr}.items)}}\")")
+                values.append(f"*{expr}.items")
+            else:
+                var = self._new_codec_var()
+                lines.append(f"{var} = []")
+                lines.append(f"{expr}._pack_values({var})")
+                values.append(f"*{var}")
+        else:
+            for field, field_type in self._struct_def(type_name).get("fields", {}).items():
+                self._codec_pack(field_type, f"{expr}.{field}", values, lines)
+
+    def _new_codec_var(self):
+        self._codec_vars += 1
+        return f"_v{self._codec_vars}"
+
+    def _kind(self, type_name):
+        if self.type_mapping.get(str(type_name).lower()) in self.primitive_types:
+            return 'primitive'
+        return self.section_kinds[self.struct_table[type_name]]
+
+    def _struct_def(self, type_name):
+        return self._schema.get(self.struct_table.get(type_name), {}).get(type_name, {})
+
+    def _field_format(self, type_name):
+        """Formato struct (senza byte order) di un tipo RIS, None se la dimensione non è fissa."""
+        kind = self._kind(type_name)
+        if kind == 'primitive':
+            return self.primitive_types[self.type_mapping[type_name.lower()]]._fixed_format()
+        struct_def = self._struct_def(type_name)
+        if kind == 'enum':
+            return RSerializable._get_format(struct_def.get("size_in_bytes", 4))
+        if kind == 'array':
+            length = struct_def.get("length_field", None)
+            element_format = self._field_format(struct_def["element_type"])
+            # array_backed: segmento a parte, letto/scritto con un solo frombuffer/tobytes
+            if isinstance(length, int) and element_format is not None and not struct_def.get("array_backed", False):
+                return element_format * length
+            return None
+        if kind == 'composite':
+            formats = [self._field_format(field_type) for field_type in struct_def.get("fields", {}).values()]
+            return None if None in formats else "".join(formats)
+        return None
+
+    def _struct_size(self, type_name, fields=None):
+        if fields is None:
+            fields = self._struct_def(type_name).get("fields", {}).items()
+        formats = [self._field_format(field_type) for _, field_type in fields]
+        return None if None in formats else struct.calcsize(self._byte_order + "".join(formats))
+
+    def _item_count(self, type_name):
+        kind = self._kind(type_name)
+        struct_def = self._struct_def(type_name)
+        if kind == 'array':
+            return struct_def["length_field"] * self._item_count(struct_def["element_type"])
+        if kind == 'composite':
+            return sum(self._item_count(field_type) for field_type in struct_def.get("fields", {}).values())
+        return 1
+
+    def _wrap_raw(self, type_name, value, unboxed=False):
+        # Espressione che costruisce il tipo a partire dal valore restituito da struct
+        if self._kind(type_name) == 'enum':
+            name = self._map_type(type_name)
+            return f"{name}._plain_from_raw({value})" if unboxed else f"{name}.from_value({value})"
+        name = self.type_mapping[type_name.lower()]
+        if name.startswith("RString"):
+            return f"{value}.rstrip(b'\\x00').decode()" if unboxed else f"{name}._from_raw({value})"
+        return value if unboxed else f"{name}({value})"
+
+
+    def _to_dict_value(self, type_name, expr, unboxed=False):
+        if unboxed and self._kind(type_name) == 'enum':
+            return f"{self._map_type(type_name)}.symbols[{expr}]"
+        if self._kind(type_name) == 'primitive':
+            name = self.type_mapping[type_name.lower()]
+            converter = "str" if name.startswith("RString") else "float" if name.startswith("RFloat") else \
+                "bool" if name == "RBool" else "int"
+            return f"{converter}({expr})"
+        return f"{expr}.to_dict()"
+
+    def _from_dict_value(self, type_name, value, unboxed=False):
+        if unboxed and self._kind(type_name) in ('primitive', 'enum'):
+            name = self._map_type(type_name)
+            return f"{name}._unboxed({name}.from_dict({value}))"
+        if self._kind(type_name) == 'primitive':
+            return f"{self.type_mapping[type_name.lower()]}({value})"
+        return f"{self._map_type(type_name)}.from_dict({value})"
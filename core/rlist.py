@@ -1,9 +1,19 @@
 import struct
 from .rserializable import RSerializable
+from .rint import RInt
+from .rfloat import RFloat
+from .rbool import RBool
+from .renum import REnum
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class RList(RSerializable):
     length_field = None
     element_type = None
+    array_backed = False  # items kept in a numpy array (numeric element types only)
 
     def __new__(cls, element_type=None, length_field=None):
         obj = super().__new__(cls)
@@ -13,36 +23,157 @@ class RList(RSerializable):
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
+        if cls.array_backed and not issubclass(cls.element_type, (RInt, RFloat, RBool, REnum)):
+            raise ValueError(f"{cls.__name__} can be array_backed only with numeric, bool or enum elements.")
 
     def __init__(self, items=None):
-        self.items = items if items is not None else []
+        if self.array_backed:
+            dtype = self._array_dtype()
+            _len = self.length_field if isinstance(self.length_field, int) else 0
+            items = self._as_array(items) if items is not None else np.zeros(_len, dtype)
+        elif items is None:
+            items = [self.element_type() for _ in range(self.length_field)] if isinstance(self.length_field, int) else []
+        self.items = items
 
 
     def serialize(self) -> bytearray:
-        data = bytearray()
-        for item in self.items:
-            data.extend(item.serialize())
+        data = bytearray(self.size_in_bytes())
+        self.serialize_into(data)
         return data
 
+    def serialize_into(self, buffer, offset: int = 0) -> int:
+        if self.array_backed:
+            if isinstance(self.length_field, int) and len(self.items) != self.length_field:
+                raise ValueError(f"{self.__class__.__name__} expects {self.length_field} elements, got {len(self.items)}")
+            # Byte dell'array scritti direttamente nel buffer, senza la copia di tobytes()
+            raw = np.ascontiguousarray(self.items, self._array_dtype()).view(np.uint8)
+            return self._write_bytes(buffer, offset, raw)
+        if self._compiled_struct() is not None:
+            return super().serialize_into(buffer, offset)
+        for item in self.items:
+            offset = item.serialize_into(buffer, offset)
+        return offset
+
     @classmethod
-    def deserialize(cls, data: bytearray, obj_ref):
-        obj = cls()
-        offset = 0
+    def deserialize(cls, data: bytearray, obj_ref=None):
+        return cls.deserialize_from(memoryview(data), 0, obj_ref)[0]
 
-        items = []
+    @classmethod
+    def deserialize_from(cls, buffer, offset: int = 0, obj_ref=None):
         _len =  cls.length_field if isinstance(cls.length_field, int) else getattr(obj_ref, cls.length_field)
+        obj = cls.__new__(cls)
+        if cls.array_backed:
+            dtype = cls._array_dtype()
+            obj.items = cls._checked_array(np.frombuffer(buffer, dtype, count=_len, offset=offset).copy())
+            return obj, offset + _len * dtype.itemsize
+        codec = cls._compiled_struct()
+        if codec is not None:
+            return cls._unpack_values(codec.unpack_from(buffer, offset), 0)[0], offset + codec.size
+
+        items = []
+        element_codec = cls.element_type._compiled_struct()
+        if issubclass(cls.element_type, REnum):
+            codes = struct.unpack_from(f"{cls.byte_order}{int(_len)}{cls.element_type._fixed_format()}", buffer, offset)
+            items = cls.element_type.from_values(codes)
+            offset += _len * element_codec.size
+        elif element_codec is not None:
+            end = offset + _len * element_codec.size
+            if end > len(buffer):
+                raise struct.error(f"unpack requires a buffer of {end - offset} bytes")
+            for values in element_codec.iter_unpack(buffer[offset:end]):
+                items.append(cls.element_type._unpack_values(values, 0)[0])
+            offset = end
+        else:
+            for _ in range(_len):
+                item, offset = cls.element_type.deserialize_from(buffer, offset)
+                items.append(item)
+        obj.items = items
+        return obj, offset
+
+    @classmethod
+    def _skip(cls, buffer, offset: int, obj_ref=None) -> int:
+        _len = cls.length_field if isinstance(cls.length_field, int) else getattr(obj_ref, cls.length_field)
+        element_size = cls.element_type.static_size()
+        if element_size is not None:
+            return offset + _len * element_size
         for _ in range(_len):
-            item = cls.element_type.deserialize(data[offset:])
+            offset = cls.element_type._skip(buffer, offset)
+        return offset
+
+    @classmethod
+    def _fixed_format(cls):
+        # Le liste array_backed non entrano negli Struct dei composite: un solo frombuffer/tobytes
+        if not isinstance(cls.length_field, int) or cls.element_type is None or cls.array_backed:
+            return None
+        element_format = cls.element_type._fixed_format()
+        return None if element_format is None else element_format * cls.length_field
+
+    @classmethod
+    def static_size(cls):
+        if cls.array_backed and isinstance(cls.length_field, int):
+            return cls.length_field * cls.element_type.static_size()
+        return super().static_size()
+
+    @classmethod
+    def _unpack_values(cls, values, index):
+        obj = cls.__new__(cls)
+        if issubclass(cls.element_type, REnum):
+            end = index + cls.length_field
+            obj.items = cls.element_type.from_values(values[index:end])
+            return obj, end
+        items = []
+        for _ in range(cls.length_field):
+            item, index = cls.element_type._unpack_values(values, index)
             items.append(item)
-            offset += len(item.serialize())
-        setattr(obj, 'items', items)
-        return obj
+        obj.items = items
+        return obj, index
+
+    def _pack_values(self, values: list):
+        if len(self.items) != self.length_field:
+            raise ValueError(f"{self.__class__.__name__} expects {self.length_field} elements, got {len(self.items)}")
+        for item in self.items:
+            item._pack_values(values)
+
+    @classmethod
+    def _array_dtype(cls):
+        if np is None:
+            raise ImportError(f"{cls.__name__} is array_backed but numpy is not installed.")
+        cache = cls.__dict__.get("_dtype_cache")
+        if cache is None or cache[0] != cls.byte_order:
+            cache = (cls.byte_order, np.dtype(cls.byte_order + cls.element_type._fixed_format()))
+            cls._dtype_cache = cache
+        return cache[1]
+
+    @classmethod
+    def _as_array(cls, items):
+        if issubclass(cls.element_type, REnum) and (not isinstance(items, np.ndarray) or items.dtype.kind in "OSU"):
+            items = [cls.element_type.from_dict(item) for item in list(items)]
+        items = np.asarray(items)
+        return cls._checked_array(items.astype(cls._array_dtype(), copy=False))
+
+    @classmethod
+    def _checked_array(cls, items):
+        if issubclass(cls.element_type, REnum) and items.size:
+            cls.element_type.check_codes(items)
+        return items
+
+    def size_in_bytes(self) -> int:
+        element_size = self.element_type.static_size()
+        if element_size is not None:
+            return element_size * len(self.items)
+        return sum(item.size_in_bytes() for item in self.items)
 
     def to_dict(self) -> list:
+        if self.array_backed:
+            if issubclass(self.element_type, REnum):
+                return [self.element_type.symbols.get(item, item) for item in self.items.tolist()]
+            return self.items.tolist()
         return [item.to_dict() for item in self.items]
 
     @classmethod
     def from_dict(cls, items):
+        if cls.array_backed:
+            return cls(cls._as_array(items))
         items = [cls.element_type.from_dict(item) for item in items]
         return cls(items)
 
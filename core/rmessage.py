@@ -1,76 +1,185 @@
 from .rserializable import RSerializable
 from .rlist import RList
+from .rfield import RField, _skip_fields
+from .rview import RView
+from .rprojection import RProjection
 
 class RMessage(RSerializable):
     id = None
     source = None
     dest = None
     header = None
+    unboxed = False  # scalar fields kept as plain int/float/str/bool
 
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
         obj = super().__new__(cls)
         return obj
 
     def __init__(self, **kwargs):
+        if self.header is not None:
+            self.header = self.header._copy()  # il Header di classe resta solo un modello condiviso
         if not hasattr(self, '__annotations__'):
             return
         for field, field_type in self.__annotations__.items():
             field_value = kwargs.get(field, None)
             if isinstance(field_value, field_type):
-                setattr(self, field, field_value)
+                value = field_value
             elif field_value is not None:
-                setattr(self, field, field_type(field_value))
+                value = field_type(field_value)
             else:
-                setattr(self, field, field_type())
+                value = field_type()
+            setattr(self, field, field_type._unboxed(value) if self.unboxed else value)
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
 
     def serialize(self) -> bytearray:
-        data = bytearray()
-        self.header.id = type(self.header.id).from_dict(self.id)
-        self.header.length = type(self.header.length).from_dict(self.header.size_in_bytes() + self.size_in_bytes())
-        data.extend(self.header.serialize())
-        if hasattr(self, '__annotations__'):
-            for field in self.__annotations__:
-                value = getattr(self, field)
-                data.extend(value.serialize())
+        data = bytearray(self.header.static_size() + self.size_in_bytes())
+        self.serialize_into(data)
         return data
 
+    def serialize_into(self, buffer, offset: int = 0) -> int:
+        header = self._stamped_header(self.header.static_size() + self.size_in_bytes())
+        codec = self._compiled_struct()
+        if codec is not None:
+            values = []
+            header._pack_values(values)
+            for field, field_type in self.__annotations__.items():
+                self._field_value(field, field_type)._pack_values(values)
+            codec.pack_into(buffer, offset, *values)
+            return offset + codec.size
+        offset = header.serialize_into(buffer, offset)
+        if hasattr(self, '__annotations__'):
+            for field, field_type in self.__annotations__.items():
+                offset = self._field_value(field, field_type).serialize_into(buffer, offset)
+        return offset
+
+    def _stamped_header(self, length: int):
+        # Copy of the header with this message's id and length: serializing never modifies shared state
+        header = self.header._copy()
+        header._set_field("id", self.id)
+        header._set_field("length", length)
+        return header
+
     @classmethod
     def deserialize(cls, data: bytearray):
-        obj = cls()
-        offset = cls.header.size_in_bytes()
+        return cls.deserialize_from(memoryview(data))[0]
+
+    @classmethod
+    def deserialize_from(cls, buffer, offset: int = 0):
+        codec = cls._compiled_struct()
+        if codec is not None:
+            return cls._unpack_values(codec.unpack_from(buffer, offset), 0)[0], offset + codec.size
+        obj = cls.__new__(cls)
+        obj.header, offset = type(cls.header).deserialize_from(buffer, offset)
         if hasattr(cls, '__annotations__'):
             for field, field_type in cls.__annotations__.items():
                 if issubclass(field_type, RList):
-                    value = field_type.deserialize(data[offset:], obj)
+                    value, offset = field_type.deserialize_from(buffer, offset, obj)
                 else:
-                    value = field_type.deserialize(data[offset:])
-                setattr(obj, field, value)
-                offset += len(value.serialize())
-        return obj
+                    value, offset = field_type.deserialize_from(buffer, offset)
+                setattr(obj, field, field_type._unboxed(value) if cls.unboxed else value)
+        return obj, offset
+
+    @classmethod
+    def view(cls, buffer, offset: int = 0):
+        """Lazy instance over buffer: header and fields are decoded on first access."""
+        return RView._view_class(cls, cls._wire_fields())._from_buffer(buffer, offset)
+
+    @classmethod
+    def project(cls, data, fields, offset: int = 0, to_dict: bool = False) -> dict:
+        """Decode only the given field paths (e.g. "header.id", "sensor.temperature"): {path: value}."""
+        return RProjection.of(cls, fields).decode(data, offset, to_dict)
+
+    @classmethod
+    def field(cls, path: str) -> RField:
+        """Fixed-size field at path, read/written in place in serialized data (see RField)."""
+        return RField.of(cls, path)
+
+    @classmethod
+    def patch(cls, buffer, values: dict, offset: int = 0):
+        """Overwrite fixed-size fields in place in a serialized message: patch(frame, {"header.seq": 7})."""
+        for path, value in values.items():
+            RField.of(cls, path).set(buffer, value, offset)
+
+    @classmethod
+    def _wire_fields(cls):
+        # (name, type) of the encoded fields, in wire order
+        return [("header", type(cls.header)), *getattr(cls, "__annotations__", {}).items()]
+
+    @classmethod
+    def _fixed_format(cls):
+        formats = [field_type._fixed_format() for field_type in cls.__annotations__.values()]
+        formats.insert(0, cls.header._fixed_format())
+        return None if None in formats else "".join(formats)
+
+    @classmethod
+    def static_size(cls):
+        # Somma dei campi: fissa anche quando un campo (lista array_backed) non ha un formato struct
+        cache = cls.__dict__.get("_size_cache")
+        if cache is None or cache[0] != cls.byte_order:
+            sizes = [field_type.static_size() for _, field_type in cls._wire_fields()]
+            cache = (cls.byte_order, None if None in sizes else sum(sizes))
+            cls._size_cache = cache
+        return cache[1]
+
+    @classmethod
+    def _skip(cls, buffer, offset: int, obj_ref=None) -> int:
+        size = cls.static_size()
+        if size is not None:
+            return offset + size
+        return _skip_fields(cls._wire_fields(), buffer, offset)
+
+    @classmethod
+    def _unpack_values(cls, values, index):
+        obj = cls.__new__(cls)
+        obj.header, index = type(cls.header)._unpack_values(values, index)
+        for field, field_type in cls.__annotations__.items():
+            if cls.unboxed:
+                value, index = field_type._unpack_unboxed(values, index)
+            else:
+                value, index = field_type._unpack_values(values, index)
+            setattr(obj, field, value)
+        return obj, index
+
+    def _pack_values(self, values: list):
+        self.header._pack_values(values)
+        for field, field_type in self.__annotations__.items():
+            self._field_value(field, field_type)._pack_values(values)
 
     def to_dict(self) -> dict:
         if not hasattr(self, '__annotations__'):
             return {}
-        return {field: getattr(self, field).to_dict() for field in self.__annotations__}
+        return {field: self._field_value(field, field_type).to_dict() for field, field_type in self.__annotations__.items()}
 
     @classmethod
     def from_dict(cls, data):
         obj = cls()
         if hasattr(cls, '__annotations__'):
             for field, field_type in cls.__annotations__.items():
-                setattr(obj, field, field_type.from_dict(data[field]))
+                value = field_type.from_dict(data[field])
+                setattr(obj, field, field_type._unboxed(value) if cls.unboxed else value)
         return obj
 
     def size_in_bytes(self) -> int:
         if not hasattr(self, '__annotations__'):
             return 0
-        return sum(len(getattr(self, field).serialize()) for field in self.__annotations__)
+        size = self.static_size()
+        if size is not None:
+            return size - self.header.static_size()
+        size = 0
+        for field, field_type in self.__annotations__.items():
+            field_size = field_type.static_size()
+            size += field_size if field_size is not None else getattr(self, field).size_in_bytes()
+        return size
+
+    def _field_value(self, field, field_type):
+        # Field as an RSerializable: unboxed scalars are wrapped only when needed
+        value = getattr(self, field)
+        return field_type._boxed(value) if self.unboxed else value
 
     def default(self):
-        res = {field: getattr(self, field).default() for field in self.__annotations__}
+        res = {field: self._field_value(field, field_type).default() for field, field_type in self.__annotations__.items()}
         for field in self.__annotations__:
             if issubclass(getattr(self, field).__class__, RList):
                 if not isinstance(getattr(self, field).length_field, int):
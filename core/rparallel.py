@@ -0,0 +1,175 @@
+import hashlib
+import mmap
+import os
+import tempfile
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from .ris_parser import RISParser
+from .rtranscoder import RTranscoder
+from .rstream import RHeaderReader
+from .rcapture import RCapture
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+OUTPUTS = ("dict", "object", "columns")
+
+_worker = None  # state of a pool process, see _init_worker
+
+
+def _load_schema(schema: str, specialized: bool, cache_dir: str):
+    with open(schema, "rb") as f:
+        digest = hashlib.sha1(f.read() + bytes([specialized])).hexdigest()[:16]
+    parser = RISParser(schema, cache_dir=cache_dir)
+    # Stesso nome di modulo nel processo principale e nei worker: gli oggetti si possono serializzare con pickle
+    classes, message_map = parser.generate_classes(specialized, module=f"{__package__}.ris_classes_{digest}")
+    header = RHeaderReader(type(next(iter(message_map.values())).header))
+    return SimpleNamespace(parser=parser, classes=classes, message_map=message_map, header=header, source=None)
+
+
+def _init_worker(schema: str, specialized: bool, cache_dir: str):
+    global _worker
+    _worker = _load_schema(schema, specialized, cache_dir)
+
+
+def _open_source(path: str, stamp):
+    # Il worker tiene mappato solo l'ultimo file letto
+    source = _worker.source
+    if source is None or source.key != (path, stamp):
+        if source is not None:
+            source.view.release()
+            source.mmap.close()
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        source = _worker.source = SimpleNamespace(key=(path, stamp), mmap=mapped, view=memoryview(mapped))
+    return source.view
+
+
+def _decode_shard(path: str, stamp, start: int, end: int, output: str):
+    view = _open_source(path, stamp)
+    message_map, peek = _worker.message_map, _worker.header.peek
+    if output == "columns":
+        frames = {}
+        while start < end:
+            message_id, length = peek(view, start)
+            frames.setdefault(message_id, []).append(view[start:start + length])
+            start += length
+        columns = {}
+        for message_id, chunks in frames.items():
+            name = message_map[message_id].__name__
+            columns[name] = np.frombuffer(b"".join(chunks), _worker.parser.numpy_dtype(name))
+        return columns
+    results = []
+    while start < end:
+        message_id, length = peek(view, start)
+        message_type = message_map.get(message_id)
+        if message_type is None:
+            raise KeyError(f"Messaggio con id {message_id} non definito")
+        frame = view[start:start + length]
+        if output == "dict":
+            results.append(RTranscoder.of(message_type).decode_from(frame)[0])
+        else:
+            results.append(message_type.deserialize_from(frame)[0])
+        start += length
+    return results
+
+
+class RParallelDecoder:
+    """
+    Decodes capture files or large buffers of back-to-back RMessage frames on a process pool.
+    The input is split into frame-aligned shards of about chunk_size bytes using the Header lengths;
+    each worker builds the schema classes once (RISParser, cache_dir makes it cheap) and reads its
+    shards from the memory-mapped file, so only (offset, end) pairs are sent to it.
+    Results are yielded in the original order while at most max_pending shards are in flight.
+    """
+
+    def __init__(self, schema: str, workers: int = None, chunk_size: int = 4 << 20, max_pending: int = None,
+                 specialized: bool = False, cache_dir: str = None):
+        self.schema = schema
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or 2 * self.workers
+        self.specialized = specialized
+        self.cache_dir = cache_dir
+        self._local = None
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    @property
+    def message_map(self) -> dict:
+        """
+        Message classes of the schema in this process (the ones decoded objects belong to).
+        They carry the schema's byte order; classes of other schemas already loaded are not affected.
+        """
+        if self._local is None:
+            self._local = _load_schema(self.schema, self.specialized, self.cache_dir)
+        return self._local.message_map
+
+    def decode_file(self, path: str, output: str = "dict"):
+        """
+        Decode the frames of a capture file, in order: dicts (as to_dict()), objects, or with
+        output="columns" one {message name: structured array} per shard (fixed-layout messages only:
+        if the capture contains a message type without a fixed layout, ValueError is raised before
+        any shard is decoded). An incomplete frame at the end of the file is ignored, as in RCapture.
+        """
+        if output not in OUTPUTS:
+            raise ValueError(f"Output {output} non valido: usare uno tra {OUTPUTS}")
+        if output == "columns" and np is None:
+            raise ImportError("numpy is required for columnar output.")
+        with RCapture(path, self.message_map) as capture:
+            offsets = capture.offsets
+            if output == "columns":
+                # Tutti i tipi presenti devono avere un dtype prima di inviare lavoro ai worker
+                for message_id in set(capture.ids):
+                    message_type = self.message_map.get(message_id)
+                    if message_type is None:
+                        raise KeyError(f"Messaggio con id {message_id} non definito")
+                    try:
+                        self._local.parser.numpy_dtype(message_type.__name__)
+                    except ValueError as error:
+                        raise ValueError(f"output='columns' non valido per {message_type.__name__}: {error}") from None
+        stat = os.stat(path)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                             initargs=(self.schema, self.specialized, self.cache_dir))
+        pending = deque()
+        index, last = 0, len(offsets) - 1
+        while index < last or pending:
+            while index < last and len(pending) < self.max_pending:
+                end = bisect_left(offsets, offsets[index] + self.chunk_size, index + 1, last)
+                pending.append(self._pool.submit(_decode_shard, path, stamp, offsets[index], offsets[end], output))
+                index = end
+            result = pending.popleft().result()
+            if output == "columns":
+                yield result
+            else:
+                yield from result
+
+    def decode_buffer(self, data, output: str = "dict"):
+        """
+        Like decode_file for frames in memory: data is written once to a temporary file
+        (in /dev/shm when available) that the workers map instead of receiving its bytes.
+        """
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        fd, path = tempfile.mkstemp(suffix=".ris", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            yield from self.decode_file(path, output)
+        finally:
+            os.unlink(path)
@@ -0,0 +1,153 @@
+import struct
+from types import SimpleNamespace
+from .rlist import RList
+
+_READ, _SKIP, _DECODE = range(3)
+
+
+class RProjection:
+    """
+    Decodes only some fields of an RComposite/RMessage, selected by dotted paths
+    ("header.id", "sensor.temperature"); decode() returns {path: value}.
+    Fields at statically known offsets are read with one padded Struct, variable-size
+    fields in between are skipped walking only list lengths and union tags.
+    """
+
+    def __init__(self, serializable_type, fields):
+        self.serializable_type = serializable_type
+        self.fields = tuple(fields)
+        self.byte_order = serializable_type.byte_order
+        tree, self._nested = {}, []
+        for path in sorted(self.fields, key=lambda path: path.count(".")):
+            node, parts = tree, path.split(".")
+            for index, part in enumerate(parts):
+                if node.get(part, ...) is None:
+                    # Campo già selezionato per intero: il sotto-campo si ricava dal suo valore
+                    self._nested.append((path, ".".join(parts[:index + 1]), parts[index + 1:]))
+                    break
+                if index == len(parts) - 1:
+                    node[part] = None
+                else:
+                    node = node.setdefault(part, {})
+        if not tree:
+            raise ValueError(f"Nessun campo selezionato per {serializable_type.__name__}")
+        self._steps, self._scopes, self._rel = [], 0, 0
+        self._flush()
+        self._compile(serializable_type, tree, "", need_end=False)
+        self._flush()
+        # Tipo di ogni campo: i valori unboxed (codici enum compresi) passano dal loro tipo in to_dict
+        self._types = {}
+        for path in self.fields:
+            field_type = serializable_type
+            for part in path.split("."):
+                field_type = dict(field_type._wire_fields())[part]
+            self._types[path] = field_type
+
+    @classmethod
+    def of(cls, serializable_type, fields):
+        """Projection of serializable_type on fields, compiled on first use."""
+        fields = tuple(fields)
+        cache = serializable_type.__dict__.get("_projection_cache")
+        if cache is None or cache[0] != serializable_type.byte_order:
+            cache = (serializable_type.byte_order, {})
+            serializable_type._projection_cache = cache
+        projection = cache[1].get(fields)
+        if projection is None:
+            projection = cache[1][fields] = cls(serializable_type, fields)
+        return projection
+
+    def decode(self, data, offset: int = 0, to_dict: bool = False) -> dict:
+        buffer = data if isinstance(data, memoryview) else memoryview(data)
+        scopes = [SimpleNamespace() for _ in range(self._scopes)]
+        result = {}
+        anchor = offset
+        for kind, rel, target, info in self._steps:
+            if kind is _READ:
+                values, index = target.unpack_from(buffer, anchor + rel), 0
+                for field_type, unboxed, scope, path, length_name in info:
+                    if unboxed:
+                        value, index = field_type._unpack_unboxed(values, index)
+                    else:
+                        value, index = field_type._unpack_values(values, index)
+                    if path is not None:
+                        result[path] = value
+                    if length_name is not None:
+                        setattr(scopes[scope], length_name, value)
+            elif kind is _SKIP:
+                anchor = target._skip(buffer, anchor + rel, None if info is None else scopes[info])
+            else:
+                unboxed, scope, path, length_name = info
+                if issubclass(target, RList):
+                    value, anchor = target.deserialize_from(buffer, anchor + rel, None if scope is None else scopes[scope])
+                else:
+                    value, anchor = target.deserialize_from(buffer, anchor + rel)
+                    if unboxed:
+                        value = target._unboxed(value)
+                result[path] = value
+                if length_name is not None:
+                    setattr(scopes[scope], length_name, value)
+        for path, whole, parts in self._nested:
+            value = result[whole]
+            for part in parts:
+                value = getattr(value, part)
+            result[path] = value
+        if to_dict:
+            return {path: self._types[path]._boxed(result[path]).to_dict() for path in self.fields}
+        return {path: result[path] for path in self.fields}
+
+    # Compilazione
+
+    def _compile(self, struct_type, tree, prefix, need_end):
+        fields = struct_type._wire_fields()
+        names = [field for field, _ in fields]
+        for field in tree:
+            if field not in names:
+                raise ValueError(f"Campo {prefix}{field} non presente in {struct_type.__name__}")
+        # La struttura si percorre solo fino all'ultimo campo richiesto
+        last = len(fields) if need_end else max(names.index(field) for field in tree) + 1
+        walked = fields[:last]
+        length_fields = {field_type.length_field for _, field_type in walked
+                         if issubclass(field_type, RList) and not isinstance(field_type.length_field, int)}
+        scope = self._scopes if length_fields else None  # lengths of this struct's lists
+        if length_fields:
+            self._scopes += 1
+        unboxed = getattr(struct_type, "unboxed", False)
+
+        for index, (field, field_type) in enumerate(walked):
+            path = prefix + field
+            selected = field in tree
+            length_name = field if field in length_fields else None
+            size = field_type.static_size()
+            fmt = field_type._fixed_format() if size is not None else None
+            more = need_end or index < last - 1
+            if selected and tree[field] is not None:
+                if not hasattr(field_type, "_wire_fields"):
+                    raise ValueError(f"Campo {path} non è un composite: non si possono selezionare i suoi campi")
+                start = self._rel
+                self._compile(field_type, tree[field], path + ".", need_end=more and size is None)
+                if size is not None:
+                    self._rel = start + size
+            elif size is not None and (fmt is not None or not selected):
+                if selected or length_name is not None:
+                    self._formats.append(f"{self._rel - self._read_end}x{fmt}")
+                    self._reads.append((field_type, unboxed, scope, path if selected else None, length_name))
+                    self._read_end = self._rel + size
+                self._rel += size
+            elif selected:
+                self._flush()
+                self._steps.append((_DECODE, self._rel, field_type, (unboxed, scope, path, length_name)))
+                self._rel = 0
+                self._flush()
+            elif more:
+                self._flush()
+                self._steps.append((_SKIP, self._rel, field_type, scope))
+                self._rel = 0
+                self._flush()
+
+    def _flush(self):
+        # Chiude il gruppo di letture a offset statico prima di un campo che sposta l'ancora
+        if getattr(self, "_reads", None):
+            codec = struct.Struct(self.byte_order + "".join(self._formats))
+            self._steps.append((_READ, self._read_start, codec, tuple(self._reads)))
+        self._reads, self._formats = [], []
+        self._read_start = self._read_end = self._rel
@@ -1,9 +1,13 @@
+import struct
+import warnings
 from collections import OrderedDict
 
 class RSerializable:
+    __slots__ = ()
     byte_order = "<"
     list_length_field_size = 4
     enum_size = 4
+    _plain_type = None  # int/float/str/bool for the scalar types, stored as is by unboxed composites
 
     @classmethod
     def __prepare__(metacls, name, bases):
@@ -24,3 +28,90 @@ class RSerializable:
     @staticmethod
     def _get_format(size):
         return {1: "B", 2: "H", 4: "I", 8: "Q"}.get(size, "I")
+
+    @classmethod
+    def _fixed_format(cls):
+        # Struct format of the wire layout (without byte order), None if the size is not fixed
+        return None
+
+    @classmethod
+    def _compiled_struct(cls):
+        cache = cls.__dict__.get("_struct_cache")
+        if cache is None or cache[0] != cls.byte_order:
+            fmt = cls._fixed_format()
+            cache = (cls.byte_order, struct.Struct(cls.byte_order + fmt) if fmt is not None else None)
+            cls._struct_cache = cache
+        return cache[1]
+
+    @classmethod
+    def static_size(cls):
+        codec = cls._compiled_struct()
+        return codec.size if codec is not None else None
+
+    def serialize_into(self, buffer, offset: int = 0) -> int:
+        codec = self._compiled_struct()
+        values = []
+        self._pack_values(values)
+        codec.pack_into(buffer, offset, *values)
+        return offset + codec.size
+
+    @classmethod
+    def deserialize_from(cls, buffer, offset: int = 0):
+        codec = cls._compiled_struct()
+        obj, _ = cls._unpack_values(codec.unpack_from(buffer, offset), 0)
+        return obj, offset + codec.size
+
+    @staticmethod
+    def _write_bytes(buffer, offset: int, raw) -> int:
+        # Come pack_into: struct.error se raw non entra nel buffer (uno slice assignment allungherebbe un bytearray)
+        end = offset + len(raw)
+        if offset < 0 or end > len(buffer):
+            raise struct.error(f"pack_into requires a buffer of at least {end} bytes for packing {len(raw)} bytes "
+                               f"at offset {offset} (actual buffer size is {len(buffer)})")
+        memoryview(buffer)[offset:end] = raw
+        return end
+
+    @classmethod
+    def _check_class_arguments(cls, **arguments):
+        # Argomenti deprecati del costruttore (size, signed): ammessi solo se uguali agli attributi della classe
+        arguments = {name: value for name, value in arguments.items() if value is not None}
+        warnings.warn(f"{cls.__name__}: the {'/'.join(arguments)} constructor arguments are deprecated, they are "
+                      f"class attributes; use the fixed-size classes (RInt16, RUint32, RFloat64, RString64...)",
+                      DeprecationWarning, stacklevel=3)
+        for name, value in arguments.items():
+            if value != getattr(cls, name):
+                raise ValueError(f"{name}={value} non valido per {cls.__name__} ({name}={getattr(cls, name)})")
+
+    @classmethod
+    def _skip(cls, buffer, offset: int, obj_ref=None) -> int:
+        # Offset just past a value encoded at offset, without decoding it
+        return offset + cls.static_size()
+
+    @classmethod
+    def _from_raw(cls, raw):
+        return cls(raw)
+
+    @classmethod
+    def _unpack_values(cls, values, index):
+        return cls._from_raw(values[index]), index + 1
+
+    def _pack_values(self, values: list):
+        values.append(self)
+
+    @classmethod
+    def _boxed(cls, value):
+        return value if isinstance(value, cls) else cls(value)
+
+    @classmethod
+    def _unboxed(cls, value):
+        return value if cls._plain_type is None else cls._plain_type(cls._boxed(value))
+
+    @classmethod
+    def _plain_from_raw(cls, raw):
+        return cls._plain_type(raw)
+
+    @classmethod
+    def _unpack_unboxed(cls, values, index):
+        if cls._plain_type is None:
+            return cls._unpack_values(values, index)
+        return cls._plain_from_raw(values[index]), index + 1
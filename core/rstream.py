@@ -0,0 +1,85 @@
+import struct
+
+
+class RHeaderReader:
+    """Reads a few fixed-size Header fields (default: id and length) with a single unpack_from."""
+
+    def __init__(self, header_type, fields=("id", "length")):
+        offsets = header_type._field_offsets()
+        field_types = header_type.__annotations__
+        layout = sorted((offsets[field], field) for field in fields)
+        if header_type.static_size() is None or any(offset is None for offset, _ in layout):
+            raise ValueError(f"{header_type.__name__} deve avere un layout fisso")
+        fmt, position = "", 0
+        for offset, field in layout:
+            fmt += f"{offset - position}x{field_types[field]._fixed_format()}"
+            position = offset + field_types[field].static_size()
+        self._codec = struct.Struct(header_type.byte_order + fmt)
+        self._positions = [[field for _, field in layout].index(field) for field in fields]
+        self.header_type = header_type
+        self.fields = tuple(fields)
+        self.size = header_type.static_size()
+
+    def peek(self, buffer, offset: int = 0) -> tuple:
+        values = self._codec.unpack_from(buffer, offset)
+        return tuple(values[position] for position in self._positions)
+
+
+class RStreamDecoder:
+    """
+    Incremental decoder for a stream of RMessage frames.
+    Chunks of any size are passed to feed(), which yields every message completed so far;
+    frames are delimited by the Header length field (header included).
+    """
+
+    def __init__(self, message_map: dict, header_type=None, lazy: bool = False):
+        self.message_map = message_map
+        self.lazy = lazy  # yield views (see RMessage.view) on a copy of each frame
+        if header_type is None:
+            header_type = type(next(iter(message_map.values())).header)
+        self.header = RHeaderReader(header_type)
+        self._buffer = bytearray()
+        self._start = 0
+
+    @property
+    def pending(self) -> int:
+        """Bytes received that do not form a complete frame yet."""
+        return len(self._buffer) - self._start
+
+    def reset(self):
+        self._buffer = bytearray()
+        self._start = 0
+
+    def feed(self, data):
+        if self._start:
+            # I frame già decodificati vengono scartati una sola volta per chunk
+            del self._buffer[:self._start]
+            self._start = 0
+        self._buffer += data
+        return self._frames()
+
+    def _frames(self):
+        while (frame := self._next_frame()) is not None:
+            message_id, start, end = frame
+            message_type = self.message_map.get(message_id)
+            if message_type is None:
+                raise KeyError(f"Messaggio con id {message_id} non definito")
+            if self.lazy:
+                message = message_type.view(bytes(self._buffer[start:end]))
+            else:
+                with memoryview(self._buffer) as view:
+                    message, _ = message_type.deserialize_from(view[start:end])
+            yield message
+
+    def _next_frame(self):
+        # (id, start, end) of the next complete frame, consumed from the buffer; None if incomplete
+        if self.pending < self.header.size:
+            return None
+        message_id, length = self.header.peek(self._buffer, self._start)
+        if length < self.header.size:
+            raise ValueError(f"Lunghezza del frame non valida: {length}")
+        if self.pending < length:
+            return None
+        start = self._start
+        self._start += length
+        return message_id, start, start + length
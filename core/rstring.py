@@ -1,10 +1,20 @@
+from functools import lru_cache
 from .rserializable import RSerializable
 
 class RString(str, RSerializable):
-    def __new__(cls, value="", size=32):
-        obj = super().__new__(cls, value[:size])
-        obj.size = size
-        return obj
+    __slots__ = ()
+    size = 32
+    cache_size = 0  # > 0: decoded values are shared through an LRU cache keyed on the raw bytes
+    _plain_type = str
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._set_decoder()
+
+    def __new__(cls, value="", size=None):
+        if size is not None:
+            cls._check_class_arguments(size=size)
+        return super().__new__(cls, value[:cls.size])
 
     def serialize(self) -> bytearray:
         encoded = self.encode("utf-8")
@@ -12,8 +22,48 @@ class RString(str, RSerializable):
 
     @classmethod
     def deserialize(cls, data: bytearray):
-        decoded = data[:cls.size].rstrip(b'\x00').decode("utf-8")
-        return cls(decoded)
+        return cls.deserialize_from(data)[0]
+
+    @classmethod
+    def _fixed_format(cls):
+        return f"{cls.size}s"
+
+    @classmethod
+    def set_cache_size(cls, size: int):
+        """Enable (size > 0) or disable (0) the decode cache of this class and its subclasses."""
+        if size < 0:
+            raise ValueError("Cache size must be >= 0.")
+        pending = [cls]
+        while pending:
+            klass = pending.pop()
+            klass.cache_size = size
+            klass._set_decoder()
+            pending.extend(klass.__subclasses__())
+
+    @classmethod
+    def cache_info(cls):
+        """hits/misses/maxsize/currsize of the decode cache, None if disabled."""
+        return cls._decoder.cache_info() if cls.cache_size else None
+
+    @classmethod
+    def _set_decoder(cls):
+        # Un decoder (ed eventualmente una cache) per classe, così le istanze condivise hanno il tipo giusto
+        cls._decoder = lru_cache(cls.cache_size)(cls._decode) if cls.cache_size else cls._decode
+
+    @classmethod
+    def _decode(cls, raw):
+        return cls(raw.rstrip(b'\x00').decode())
+
+    @classmethod
+    def _from_raw(cls, raw):
+        return cls._decoder(raw)
+
+    @classmethod
+    def _plain_from_raw(cls, raw):
+        return raw.rstrip(b'\x00').decode()
+
+    def _pack_values(self, values: list):
+        values.append(self.encode("utf-8"))
 
     def to_dict(self) -> str:
         return str(self)
@@ -28,39 +78,34 @@ class RString(str, RSerializable):
     def __repr__(self):
         return f"{self.__class__.__name__}(value='{str(self)}', size={self.size})"
 
+RString._set_decoder()
+
 # Classi derivate con dimensioni fisse
 class RString8(RString):
+    __slots__ = ()
     size = 8
-    def __new__(cls, value=""):
-        return super().__new__(cls, value, cls.size)
 
 class RString16(RString):
+    __slots__ = ()
     size = 16
-    def __new__(cls, value=""):
-        return super().__new__(cls, value, cls.size)
 
 
 class RString32(RString):
+    __slots__ = ()
     size = 32
-    def __new__(cls, value=""):
-        return super().__new__(cls, value, cls.size)
 
 class RString40(RString):
+    __slots__ = ()
     size = 40
-    def __new__(cls, value=""):
-        return super().__new__(cls, value, cls.size)
 
 class RString64(RString):
+    __slots__ = ()
     size = 64
-    def __new__(cls, value=""):
-        return super().__new__(cls, value, cls.size)
 
 class RString128(RString):
+    __slots__ = ()
     size = 128
-    def __new__(cls, value=""):
-        return super().__new__(cls, value, cls.size)
 
 class RString256(RString):
+    __slots__ = ()
     size = 256
-    def __new__(cls, value=""):
-        return super().__new__(cls, value, cls.size)
@@ -0,0 +1,69 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .rstream import RHeaderReader
+
+_pools = {}  # workers -> ThreadPoolExecutor shared by the calls below
+_pools_lock = threading.Lock()
+
+
+def _free_threaded() -> bool:
+    # CPython 3.13+ compilato senza GIL (e con il GIL non riattivato a runtime)
+    return not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def _pool(workers: int) -> ThreadPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ThreadPoolExecutor(workers, thread_name_prefix="rip")
+        return pool
+
+
+def _run(function, items, workers, chunk_size):
+    # Chunks of items processed on the pool; results concatenated in the original order
+    items = list(items)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if _free_threaded() else 1
+    if workers <= 1 or len(items) <= chunk_size:
+        return function(items)
+    chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+    results = []
+    for chunk in _pool(workers).map(function, chunks):
+        results.extend(chunk)
+    return results
+
+
+def serialize_many(messages, workers: int = None, chunk_size: int = 256) -> list:
+    """
+    Serialize messages on a thread pool: [message.serialize() for message in messages].
+    Encoding does not modify shared state, so it scales with the cores on free-threaded CPython;
+    with workers=None and the GIL enabled it runs in the calling thread.
+    """
+    return _run(lambda chunk: [message.serialize() for message in chunk], messages, workers, chunk_size)
+
+
+def deserialize_many(frames, message_map, workers: int = None, chunk_size: int = 256, header_type=None) -> list:
+    """
+    Decode frames on a thread pool, in order. message_map is {id: message class} (the type of each
+    frame is read from its Header) or a single RSerializable type shared by all the frames.
+    """
+    if isinstance(message_map, dict):
+        if header_type is None:
+            header_type = type(next(iter(message_map.values())).header)
+        peek = RHeaderReader(header_type).peek
+
+        def decode(chunk):
+            messages = []
+            for frame in chunk:
+                message_id, _ = peek(frame)
+                message_type = message_map.get(message_id)
+                if message_type is None:
+                    raise KeyError(f"Messaggio con id {message_id} non definito")
+                messages.append(message_type.deserialize(frame))
+            return messages
+    else:
+        def decode(chunk):
+            return [message_map.deserialize(frame) for frame in chunk]
+    return _run(decode, frames, workers, chunk_size)
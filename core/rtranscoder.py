@@ -0,0 +1,303 @@
+import json
+import struct
+from types import SimpleNamespace
+from .rint import RInt
+from .rfloat import RFloat
+from .rbool import RBool
+from .rstring import RString
+from .renum import REnum
+from .rlist import RList
+from .rcomposite import RComposite
+from .rmessage import RMessage
+from .runion import RUnion
+
+
+class RTranscoder:
+    """
+    Wire bytes <-> plain values of one RSerializable type, without building instances.
+    decode() returns what deserialize(data).to_dict() returns and encode() the bytes
+    of from_dict(value).serialize(); each type is compiled once into Structs and closures.
+    """
+
+    def __init__(self, serializable_type):
+        self.serializable_type = serializable_type
+        self.byte_order = serializable_type.byte_order
+        self._nodes = {}
+        self._root = self._node(serializable_type)
+
+    @classmethod
+    def of(cls, serializable_type):
+        """Transcoder of serializable_type, compiled on first use."""
+        cache = serializable_type.__dict__.get("_transcoder_cache")
+        if cache is None or cache[0] != serializable_type.byte_order:
+            cache = (serializable_type.byte_order, cls(serializable_type))
+            serializable_type._transcoder_cache = cache
+        return cache[1]
+
+    def decode(self, data):
+        return self._root.decode(memoryview(data), 0, None)[0]
+
+    def decode_from(self, buffer, offset: int = 0):
+        return self._root.decode(buffer, offset, None)
+
+    def encode(self, value) -> bytearray:
+        out = bytearray()
+        self._root.encode(value, out)
+        return out
+
+    def to_json(self, data, **kwargs) -> str:
+        return json.dumps(self.decode(data), **kwargs)
+
+    def from_json(self, text) -> bytearray:
+        return self.encode(json.loads(text))
+
+    # Compilazione
+
+    def _node(self, node_type):
+        node = self._nodes.get(node_type)
+        if node is None:
+            if issubclass(node_type, RMessage):
+                node = self._message(node_type)
+            elif issubclass(node_type, RComposite):
+                node = self._fields(list(node_type.__annotations__.items()))
+            elif issubclass(node_type, RList):
+                node = self._list(node_type)
+            elif issubclass(node_type, RUnion):
+                node = self._union(node_type)
+            else:
+                node = self._leaf(node_type)
+            self._nodes[node_type] = node
+        return node
+
+    def _fixed(self, node):
+        # decode/encode of a fixed-size node through a single Struct
+        codec = struct.Struct(self.byte_order + node.fmt)
+        build, flatten = node.build, node.flatten
+
+        def decode(buffer, offset, parent):
+            return build(codec.unpack_from(buffer, offset), 0)[0], offset + codec.size
+
+        def encode(value, out):
+            values = []
+            flatten(value, values)
+            out += codec.pack(*values)
+
+        node.decode, node.encode = decode, encode
+        return node
+
+    def _leaf(self, leaf_type):
+        convert = None  # None: struct already returns the to_dict() value
+        if issubclass(leaf_type, RString):
+            size = leaf_type.size
+            convert = lambda raw: raw.rstrip(b'\x00').decode()
+            to_raw = lambda value: value[:size].encode("utf-8")
+        elif issubclass(leaf_type, REnum):
+            symbols = leaf_type.symbols
+
+            def convert(raw):
+                try:
+                    return symbols[raw]
+                except KeyError:
+                    raise ValueError(f"Valore {raw} non valido per {leaf_type.__name__}") from None
+            to_raw = lambda value: int(leaf_type.from_dict(value))
+        elif issubclass(leaf_type, RBool):
+            to_raw = bool
+        elif issubclass(leaf_type, RInt):
+            to_raw = int
+        elif issubclass(leaf_type, RFloat):
+            to_raw = float
+        else:
+            raise ValueError(f"{leaf_type.__name__} non è supportato dal transcoder")
+
+        if convert is None:
+            build = lambda values, index: (values[index], index + 1)
+        else:
+            build = lambda values, index: (convert(values[index]), index + 1)
+
+        def flatten(value, values):
+            values.append(to_raw(value))
+
+        return self._fixed(SimpleNamespace(fmt=leaf_type._fixed_format(), convert=convert, to_raw=to_raw,
+                                           build=build, flatten=flatten, leaf=True))
+
+    def _fields(self, fields):
+        nodes = [(field, self._node(field_type)) for field, field_type in fields]
+        if all(node.fmt is not None for _, node in nodes):
+            names = [field for field, _ in nodes]
+            if all(getattr(node, "leaf", False) and node.convert is None for _, node in nodes):
+                count = len(names)
+                build = lambda values, index: (dict(zip(names, values[index:index + count])), index + count)
+            else:
+                def build(values, index):
+                    result = {}
+                    for field, node in nodes:
+                        result[field], index = node.build(values, index)
+                    return result, index
+
+            def flatten(value, values):
+                for field, node in nodes:
+                    node.flatten(value[field], values)
+
+            fmt = "".join(node.fmt for _, node in nodes)
+            return self._fixed(SimpleNamespace(fmt=fmt, build=build, flatten=flatten))
+
+        # Layout variabile: i campi fissi consecutivi vengono letti con un solo Struct
+        segments = []
+        for field, node in nodes:
+            if node.fmt is not None and segments and segments[-1][0] is not None:
+                segments[-1][1].append((field, node))
+            elif node.fmt is not None:
+                segments.append([True, [(field, node)]])
+            else:
+                segments.append([None, (field, node)])
+        for segment in segments:
+            if segment[0] is not None:
+                segment[0] = struct.Struct(self.byte_order + "".join(node.fmt for _, node in segment[1]))
+
+        def decode(buffer, offset, parent):
+            result = {}
+            for codec, content in segments:
+                if codec is None:
+                    field, node = content
+                    result[field], offset = node.decode(buffer, offset, result)
+                else:
+                    values, index = codec.unpack_from(buffer, offset), 0
+                    for field, node in content:
+                        result[field], index = node.build(values, index)
+                    offset += codec.size
+            return result, offset
+
+        def encode(value, out):
+            for codec, content in segments:
+                if codec is None:
+                    field, node = content
+                    node.encode(value[field], out)
+                else:
+                    values = []
+                    for field, node in content:
+                        node.flatten(value[field], values)
+                    out += codec.pack(*values)
+
+        return SimpleNamespace(fmt=None, decode=decode, encode=encode)
+
+    def _message(self, message_type):
+        body = self._fields(list(getattr(message_type, "__annotations__", {}).items()))
+        header = self._node(type(message_type.header))
+        if header.fmt is None:
+            raise ValueError(f"L'header di {message_type.__name__} deve avere un layout fisso")
+        header_codec = struct.Struct(self.byte_order + header.fmt)
+        body_decode, body_encode = body.decode, body.encode
+
+        def decode(buffer, offset, parent):
+            return body_decode(buffer, offset + header_codec.size, None)
+
+        def encode(value, out):
+            start = len(out)
+            out += bytes(header_codec.size)
+            body_encode(value, out)
+            header_value = message_type.header.to_dict()
+            header_value["id"] = message_type.id
+            header_value["length"] = len(out) - start
+            values = []
+            header.flatten(header_value, values)
+            header_codec.pack_into(out, start, *values)
+
+        return SimpleNamespace(fmt=None, decode=decode, encode=encode)
+
+    def _list(self, list_type):
+        element = self._node(list_type.element_type)
+        length_field = list_type.length_field
+        fixed_count = length_field if isinstance(length_field, int) else None
+
+        def check(value):
+            if fixed_count is not None and len(value) != fixed_count:
+                raise ValueError(f"{list_type.__name__} expects {fixed_count} elements, got {len(value)}")
+
+        if element.fmt is not None and getattr(element, "leaf", False):
+            convert, to_raw = element.convert, element.to_raw
+            raw_list = list if convert is None else lambda values: [convert(raw) for raw in values]
+
+            def flatten(value, values):
+                check(value)
+                values.extend(to_raw(item) for item in value)
+
+            if fixed_count is not None:
+                build = lambda values, index: (raw_list(values[index:index + fixed_count]), index + fixed_count)
+                return self._fixed(SimpleNamespace(fmt=element.fmt * fixed_count, build=build, flatten=flatten))
+
+            element_size = struct.calcsize(self.byte_order + element.fmt)
+
+            def decode(buffer, offset, parent):
+                count = parent[length_field]
+                values = struct.unpack_from(f"{self.byte_order}{count}{element.fmt}", buffer, offset)
+                return raw_list(values), offset + count * element_size
+
+            def encode(value, out):
+                out += struct.pack(f"{self.byte_order}{len(value)}{element.fmt}", *(to_raw(item) for item in value))
+
+            return SimpleNamespace(fmt=None, decode=decode, encode=encode)
+
+        if element.fmt is not None:
+            element_build, element_flatten = element.build, element.flatten
+
+            def build(values, index):
+                result = []
+                for _ in range(fixed_count):
+                    item, index = element_build(values, index)
+                    result.append(item)
+                return result, index
+
+            def flatten(value, values):
+                check(value)
+                for item in value:
+                    element_flatten(item, values)
+
+            if fixed_count is not None:
+                return self._fixed(SimpleNamespace(fmt=element.fmt * fixed_count, build=build, flatten=flatten))
+            element_codec = struct.Struct(self.byte_order + element.fmt)
+
+            def decode(buffer, offset, parent):
+                count = parent[length_field]
+                end = offset + count * element_codec.size
+                if end > len(buffer):
+                    raise struct.error(f"unpack requires a buffer of {end - offset} bytes")
+                result = [element_build(values, 0)[0] for values in element_codec.iter_unpack(buffer[offset:end])]
+                return result, end
+        else:
+            def decode(buffer, offset, parent):
+                count = fixed_count if fixed_count is not None else parent[length_field]
+                result = []
+                for _ in range(count):
+                    item, offset = element.decode(buffer, offset, None)
+                    result.append(item)
+                return result, offset
+
+        def encode(value, out):
+            check(value)
+            for item in value:
+                element.encode(item, out)
+
+        return SimpleNamespace(fmt=None, decode=decode, encode=encode)
+
+    def _union(self, union_type):
+        tag_codec = struct.Struct(self.byte_order + union_type._get_format(union_type.tag_field_size))
+        variants = [(name, self._node(variant)) for name, variant in union_type.possible_types.items()]
+        tags = {name: (tag, node) for tag, (name, node) in enumerate(variants)}
+
+        def decode(buffer, offset, parent):
+            tag, = tag_codec.unpack_from(buffer, offset)
+            if tag >= len(variants):
+                raise ValueError(f"Tag {tag} non valido per {union_type.__name__}")
+            name, node = variants[tag]
+            value, offset = node.decode(buffer, offset + tag_codec.size, None)
+            return {name: value}, offset
+
+        def encode(value, out):
+            name, variant_value = next(iter(value.items()))
+            if name not in tags:
+                raise ValueError(f"Tipo {name} non valido per {union_type.__name__}")
+            tag, node = tags[name]
+            out += tag_codec.pack(tag)
+            node.encode(variant_value, out)
+
+        return SimpleNamespace(fmt=None, decode=decode, encode=encode)
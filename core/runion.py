@@ -3,12 +3,10 @@ from .rserializable import RSerializable
 
 class RUnion(RSerializable):
     possible_types = {}
+    tag_field_size = 1
 
-    def __new__(cls, possible_types=None, tag_field_size=1):
+    def __new__(cls, *args, **kwargs):
         obj = super().__new__(cls)
-        if not obj.possible_types:
-            obj.possible_types = possible_types or {}
-        obj.tag_field_size = tag_field_size
         obj.selected_type = None
         obj.value = None
         return obj
@@ -17,42 +15,80 @@ class RUnion(RSerializable):
         super().__init_subclass__(**kwargs)
         if not hasattr(cls, "possible_types") or not cls.possible_types:
             raise ValueError(f"La classe {cls.__name__} deve avere un attributo 'possible_types'.")
+        cls._variants = tuple(cls.possible_types.items())  # tag -> (name, type)
+        cls._tags = {name: tag for tag, name in enumerate(cls.possible_types)}  # name -> tag
 
     def __init__(self, selected_type=None, value=None):
         if selected_type and selected_type in self.possible_types:
             self.selected_type = selected_type
-            self.value = self.possible_types[selected_type](value)
+            self.value = self.possible_types[selected_type]._boxed(value)
         else:
-            self.selected_type = list(self.possible_types.keys())[0]
-            self.value = self.possible_types[self.selected_type]()
+            self.selected_type, variant = self._variants[0]
+            self.value = variant()
+
+    @classmethod
+    def _tag_struct(cls):
+        cache = cls.__dict__.get("_tag_cache")
+        if cache is None or cache[0] != cls.byte_order:
+            cache = (cls.byte_order, struct.Struct(cls.byte_order + cls._get_format(cls.tag_field_size)))
+            cls._tag_cache = cache
+        return cache[1]
+
+    @classmethod
+    def _variant(cls, buffer, offset: int):
+        tag, = cls._tag_struct().unpack_from(buffer, offset)
+        if tag >= len(cls._variants):
+            raise ValueError(f"Tag {tag} non valido per {cls.__name__}")
+        return cls._variants[tag]
+
+    @classmethod
+    def _make(cls, selected_type, value):
+        obj = cls.__new__(cls)
+        obj.selected_type = selected_type
+        obj.value = value
+        return obj
 
     def serialize(self) -> bytearray:
-        data = bytearray()
-        type_index = list(self.possible_types.keys()).index(self.selected_type)
-        data.extend(struct.pack(f"{self.byte_order}{self._get_format(self.tag_field_size)}", type_index))
-        data.extend(self.value.serialize())
+        data = bytearray(self.size_in_bytes())
+        self.serialize_into(data)
         return data
 
+    def serialize_into(self, buffer, offset: int = 0) -> int:
+        tag = self._tags.get(self.selected_type)
+        if tag is None:
+            raise ValueError(f"Tipo {self.selected_type} non valido per {self.__class__.__name__}")
+        self._tag_struct().pack_into(buffer, offset, tag)
+        return self.value.serialize_into(buffer, offset + self.tag_field_size)
+
     @classmethod
     def deserialize(cls, data: bytearray):
-        obj = cls()
-        offset = 0
-        type_index = struct.unpack(f"{cls.byte_order}{cls._get_format(obj.tag_field_size)}", data[:obj.tag_field_size])[0]
-        offset += obj.tag_field_size
+        return cls.deserialize_from(memoryview(data))[0]
 
-        selected_type = list(cls.possible_types.keys())[type_index]
-        value = cls.possible_types[selected_type]().deserialize(data[offset:])
+    @classmethod
+    def deserialize_from(cls, buffer, offset: int = 0):
+        selected_type, variant = cls._variant(buffer, offset)
+        value, offset = variant.deserialize_from(buffer, offset + cls.tag_field_size)
+        return cls._make(selected_type, value), offset
+
+    @classmethod
+    def _skip(cls, buffer, offset: int, obj_ref=None) -> int:
+        return cls._variant(buffer, offset)[1]._skip(buffer, offset + cls.tag_field_size)
 
-        return cls(selected_type, value)
+    def size_in_bytes(self) -> int:
+        value_size = self.possible_types[self.selected_type].static_size()
+        if value_size is None:
+            value_size = self.value.size_in_bytes()
+        return self.tag_field_size + value_size
 
     def to_dict(self) -> dict:
         return {self.selected_type: self.value.to_dict()}
 
     @classmethod
     def from_dict(cls, data):
-        selected_type = list(data.keys())[0]
-        value = data[selected_type]
-        return cls(selected_type, value)
+        selected_type, value = next(iter(data.items()))
+        if selected_type not in cls.possible_types:
+            raise ValueError(f"Tipo {selected_type} non valido per {cls.__name__}")
+        return cls._make(selected_type, cls.possible_types[selected_type].from_dict(value))
 
     def __repr__(self):
         return f"BaseUnion(selected_type={self.selected_type}, value={self.value}, tag_field_size={self.tag_field_size})"
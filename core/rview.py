@@ -0,0 +1,103 @@
+from .rlist import RList
+
+
+class _RViewField:
+    # Data descriptor: decodes the field from the view buffer on first read, then caches it
+    def __init__(self, name, index, default=None):
+        self.name = name
+        self.index = index
+        self.default = default  # class attribute shadowed by the field (RMessage.header)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self if self.default is None else self.default
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            return obj._view_decode(self.index)
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+        obj.__dict__["_view_dirty"] = True
+
+
+class RView:
+    """
+    Lazy counterpart of an RComposite/RMessage, built with cls.view(buffer).
+    Keeps a reference to the buffer and decodes a field only when it is read;
+    serialize() returns the original bytes as long as nothing has been modified.
+    """
+    _view_fields = ()
+
+    @classmethod
+    def _view_class(cls, base, fields):
+        view_class = base.__dict__.get("_view_cache")
+        if view_class is None:
+            namespace = {"__annotations__": getattr(base, "__annotations__", {}), "_view_fields": tuple(fields)}
+            for index, (field, _) in enumerate(fields):
+                namespace[field] = _RViewField(field, index, getattr(base, field, None))
+            view_class = type(f"{base.__name__}View", (cls, base), namespace)
+            base._view_cache = view_class
+        return view_class
+
+    @classmethod
+    def _from_buffer(cls, buffer, offset: int = 0):
+        obj = cls.__new__(cls)
+        offsets = [offset]
+        for _, field_type in cls._view_fields:
+            size = field_type.static_size()
+            if size is None:
+                break
+            offsets.append(offsets[-1] + size)
+        obj.__dict__.update(_view_buffer=buffer, _view_offsets=offsets, _view_dirty=False)
+        return obj
+
+    def _view_offset_of(self, index: int) -> int:
+        offsets = self._view_offsets
+        while len(offsets) <= index:
+            field_type = self._view_fields[len(offsets) - 1][1]
+            size = field_type.static_size()
+            start = offsets[-1]
+            offsets.append(start + size if size is not None else field_type._skip(self._view_buffer, start, self))
+        return offsets[index]
+
+    def _view_decode(self, index: int):
+        field, field_type = self._view_fields[index]
+        start = self._view_offset_of(index)
+        if issubclass(field_type, RList):
+            value, end = field_type.deserialize_from(self._view_buffer, start, self)
+        else:
+            value, end = field_type.deserialize_from(self._view_buffer, start)
+            if self.unboxed:
+                value = field_type._unboxed(value)
+        if len(self._view_offsets) == index + 1:
+            self._view_offsets.append(end)
+        self.__dict__[field] = value
+        return value
+
+    def _view_end(self) -> int:
+        return self._view_offset_of(len(self._view_fields))
+
+    def _view_unchanged(self) -> bool:
+        if self._view_dirty:
+            return False
+        for index, (field, _) in enumerate(self._view_fields):
+            value = self.__dict__.get(field)
+            # Gli scalari sono immutabili: solo liste, composite e union possono essere cambiati sul posto
+            if value is None or isinstance(value, (int, float, str)):
+                continue
+            start, end = self._view_offset_of(index), self._view_offset_of(index + 1)
+            if value.serialize() != self._view_buffer[start:end]:
+                return False
+        return True
+
+    def serialize(self) -> bytearray:
+        if self._view_unchanged():
+            return bytearray(self._view_buffer[self._view_offsets[0]:self._view_end()])
+        return super().serialize()
+
+    def serialize_into(self, buffer, offset: int = 0) -> int:
+        if self._view_unchanged():
+            raw = self._view_buffer[self._view_offsets[0]:self._view_end()]
+            return self._write_bytes(buffer, offset, raw)
+        return super().serialize_into(buffer, offset)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from rip.core import RISParser
+
+SCHEMA = {
+    "metadata": {"byte_order": "<", "enum_size_in_bytes": 4, "list_length_field_size": 4},
+    "composites": {
+        "Header": {"fields": {"id": "uint16", "length": "uint32", "source": "uint8", "dest": "uint8", "seq": "uint32"}},
+        "Block": {"fields": {"gain": "float32", "samples": "Samples", "crc": "uint16"}},
+    },
+    "arrays": {"Samples": {"element_type": "float32", "length_field": 1024, "array_backed": True}},
+    "messages": {
+        "FixedWave": {"id": 1, "source": 1, "dest": 2, "fields": {"stamp": "int64", "block": "Block", "flag": "bool"}},
+    },
+}
+
+
+@pytest.mark.parametrize("byte_order", ["<", ">"])
+@pytest.mark.parametrize("specialized", [False, True])
+def test_fixed_length_array_backed_field(specialized, byte_order):
+    parser = RISParser()
+    parser.load_schema(dict(SCHEMA, metadata=dict(SCHEMA["metadata"], byte_order=byte_order)))
+    classes, _ = parser.generate_classes(specialized)
+    samples = np.linspace(-1, 1, 1024, dtype=np.float32)
+    message = classes.FixedWave.from_dict({"stamp": 7, "block": {"gain": 0.5, "samples": samples, "crc": 9}, "flag": True})
+
+    assert classes.FixedWave.static_size() == 12 + 8 + 4 + 4096 + 2 + 1
+    frame = message.serialize()
+    assert len(frame) == classes.FixedWave.static_size()
+    # I campioni sono scritti così come sono, senza passare da una lista Python
+    start = 12 + 8 + 4
+    assert np.array_equal(np.frombuffer(bytes(frame[start:start + 4096]), byte_order + "f4"), samples)
+
+    decoded = classes.FixedWave.deserialize(frame)
+    assert isinstance(decoded.block.samples.items, np.ndarray)
+    assert np.array_equal(decoded.block.samples.items, samples)
+    assert decoded.block.crc == 9 and decoded.flag
+    assert decoded.serialize() == frame
+    assert classes.FixedWave.project(frame, ["block.crc", "flag"]) == {"block.crc": 9, "flag": True}
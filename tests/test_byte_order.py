@@ -0,0 +1,36 @@
+import copy
+import random
+
+import pytest
+
+from rip.core import RISParser, RInt32
+from rip.core.rserializable import RSerializable
+from rip.benchmarks.schemas import build_schema, sample_value
+
+
+def load(schema, specialized):
+    parser = RISParser()
+    parser.load_schema(schema)
+    return parser.generate_classes(specialized)
+
+
+@pytest.mark.parametrize("specialized", [False, True])
+def test_schemas_with_different_byte_order(specialized):
+    little = build_schema(list_size=3, depth=2, width=10, enums=2, enum_values=3, numpy_lists=False)
+    big = copy.deepcopy(little)
+    big["metadata"]["byte_order"] = ">"
+    value = sample_value(little, "SensorBatch", random.Random(1), 3)
+
+    classes, _ = load(little, specialized)
+    frame = classes.SensorBatch.from_dict(value).serialize()
+    big_classes, _ = load(big, specialized)
+
+    # Il secondo schema non cambia le classi del primo né i tipi di rip.core
+    assert classes.SensorBatch.from_dict(value).serialize() == frame
+    assert classes.SensorBatch.deserialize(frame).stamp == value["stamp"]
+    assert RSerializable.byte_order == "<" and RInt32.byte_order == "<"
+
+    big_frame = big_classes.SensorBatch.from_dict(value).serialize()
+    assert big_frame[:2] == frame[:2][::-1]  # Header.id uint16
+    assert big_classes.SensorBatch.deserialize(big_frame).to_dict() == classes.SensorBatch.deserialize(frame).to_dict()
+    assert big_classes.SensorBatch.byte_order == ">" and big_classes.Header.byte_order == ">"
@@ -0,0 +1,61 @@
+import hashlib
+import json
+import os
+
+import yaml
+
+from rip.core import RISParser
+from rip.core.ris_parser import library_version
+from rip.benchmarks.schemas import build_schema
+
+
+def test_cache_prunes_other_library_versions(tmp_path):
+    schema = tmp_path / "schema.yaml"
+    schema.write_text(yaml.safe_dump(build_schema(list_size=3, depth=2, width=10, enums=2, enum_values=3)))
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    stale = ["0123456789abcdef-" + "0" * 64 + ".ripc", "f" * 64 + ".ripc"]
+    for name in stale + ["notes.txt"]:
+        (cache_dir / name).write_bytes(b"stale")
+
+    parser = RISParser(str(schema), cache_dir=str(cache_dir))
+    entry = os.path.basename(parser._cache_path)
+    assert entry.startswith(library_version()[:16] + "-")
+    names = sorted(os.listdir(cache_dir))
+    assert names == sorted(["notes.txt", entry])
+
+    # Seconda esecuzione: voce trovata, nessuna nuova scrittura
+    cached = RISParser(str(schema), cache_dir=str(cache_dir))
+    assert cached._cache is not None
+    assert sorted(os.listdir(cache_dir)) == names
+
+
+def test_cache_entry_is_json_and_checked_before_use(tmp_path):
+    schema = tmp_path / "schema.yaml"
+    schema.write_text(yaml.safe_dump(build_schema(list_size=3, depth=2, width=10, enums=2, enum_values=3)))
+    cache_dir = tmp_path / "cache"
+    parser = RISParser(str(schema), cache_dir=str(cache_dir))
+    reference = parser.generate_classes()[0].WideMessage.static_size()
+    path = parser._cache_path
+    data = open(path, "rb").read()
+    header, blob = data.split(b"\n", 1)
+    entry = json.loads(header)
+    assert entry["schema"] == parser.ris_schema
+    assert entry["schema_digest"] == hashlib.sha256(schema.read_bytes()).hexdigest()
+    assert b"pickle" not in data and not data.startswith(b"\x80")
+
+    cached = RISParser(str(schema), cache_dir=str(cache_dir))
+    assert cached._cache is not None
+    assert cached.type_graph() == parser.type_graph()
+    assert cached.generate_classes()[0].WideMessage.static_size() == reference
+
+    # Codice alterato o voce di un altro schema: la voce viene scartata e riscritta
+    tampered = [header + b"\n" + blob[:-1] + bytes([blob[-1] ^ 1]),
+                json.dumps(dict(entry, schema_digest="0" * 64)).encode() + b"\n" + blob]
+    for bad in tampered:
+        with open(path, "wb") as f:
+            f.write(bad)
+        assert not RISParser(cache_dir=str(cache_dir))._load_cache(schema.read_bytes())
+        recompiled = RISParser(str(schema), cache_dir=str(cache_dir))
+        assert recompiled.generate_classes()[0].WideMessage.static_size() == reference
+        assert open(path, "rb").read().split(b"\n", 1)[0] == header
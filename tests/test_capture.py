@@ -0,0 +1,26 @@
+import random
+
+from rip.core import RISParser, RCapture
+from rip.benchmarks.schemas import build_schema, sample_value
+
+
+def test_close_while_frames_are_held(tmp_path):
+    schema = build_schema(list_size=3, depth=2, width=10, enums=2, enum_values=3, numpy_lists=False)
+    parser = RISParser()
+    parser.load_schema(schema)
+    classes, message_map = parser.generate_classes()
+    rng = random.Random(5)
+    frames = [bytes(classes.SensorMessage.from_dict(sample_value(schema, "SensorMessage", rng, 3)).serialize())
+              for _ in range(10)]
+    path = tmp_path / "capture.bin"
+    path.write_bytes(b"".join(frames))
+
+    with RCapture(str(path), message_map) as capture:
+        frame = capture.frame(3)
+        lazy = capture.message(4, lazy=True)
+        file = capture._file
+    # Il with non solleva BufferError e il file viene chiuso; le viste restano valide
+    assert file.closed
+    assert bytes(frame) == frames[3]
+    assert lazy.to_dict() == classes.SensorMessage.deserialize(frames[4]).to_dict()
+    capture.close()
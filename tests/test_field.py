@@ -0,0 +1,115 @@
+import copy
+
+import pytest
+
+from rip.core import RISParser
+
+SCHEMA = {
+    "composites": {
+        "Header": {"fields": {"id": "uint16", "length": "uint32", "source": "uint8", "dest": "uint8", "seq": "uint32"}},
+        "Inner": {"fields": {"a": "int16", "status": "Status", "tag": "string8"}},
+        "Outer": {"fields": {"k": "uint8", "inner": "Inner", "z": "float64"}},
+        "UInner": {"unboxed": True, "fields": {"a": "int16", "status": "Status"}},
+        "UOuter": {"unboxed": True, "fields": {"u": "UInner", "w": "uint32"}},
+        "Point": {"fields": {"x": "int32", "y": "int32"}},
+        "Var": {"fields": {"count": "uint8", "points": "Points", "last": "Inner"}},
+    },
+    "enums": {"Status": {"values": {"OK": 0, "WARNING": 1, "ERROR": 2}, "size_in_bytes": 2}},
+    "arrays": {"Points": {"element_type": "Point", "length_field": "count"},
+               "More": {"element_type": "Point", "length_field": "n"}},
+    "messages": {
+        "Patched": {"id": 1, "source": 1, "dest": 2, "fields": {
+            "outer": "Outer", "uouter": "UOuter", "n": "uint16", "points": "More",
+            "var": "Var", "after": "Outer", "tail": "int64"}},
+    },
+}
+
+VALUE = {
+    "outer": {"k": 1, "inner": {"a": -3, "status": "OK", "tag": "abc"}, "z": 2.5},
+    "uouter": {"u": {"a": 4, "status": "WARNING"}, "w": 5},
+    "n": 3, "points": [{"x": i, "y": -i} for i in range(3)],
+    "var": {"count": 2, "points": [{"x": 7, "y": 8}, {"x": 9, "y": 10}], "last": {"a": -3, "status": "OK", "tag": "abc"}},
+    "after": {"k": 6, "inner": {"a": 5, "status": "WARNING", "tag": "def"}, "z": -1.0},
+    "tail": 11,
+}
+
+PATCHES = {
+    "header.seq": 77,
+    "outer.k": 200,                                  # prima della lista variabile
+    "outer.inner.a": 1234,                           # composite annidati
+    "outer.inner.status": "ERROR",
+    "outer.inner": {"a": 9, "status": "WARNING", "tag": "xyz"},
+    "uouter.u.status": "ERROR",                      # composite unboxed
+    "uouter.u": {"a": -9, "status": "OK"},
+    "uouter.w": 4000000000,
+    "var.count": 2,
+    "var.last.a": -77,                               # dopo la lista del composite: offset letto dal buffer
+    "after.inner.tag": "after",                      # dopo la lista del messaggio
+    "after.z": 0.125,
+    "tail": -5,
+}
+
+
+@pytest.fixture(scope="module", params=[(False, "<"), (True, "<"), (False, ">"), (True, ">")],
+                ids=["generic-le", "specialized-le", "generic-be", "specialized-be"])
+def message_type(request):
+    specialized, byte_order = request.param
+    parser = RISParser()
+    parser.load_schema(dict(SCHEMA, metadata={"byte_order": byte_order, "enum_size_in_bytes": 4,
+                                              "list_length_field_size": 4}))
+    return parser.generate_classes(specialized)[0].Patched
+
+
+def expected_frame(message_type, values):
+    # Serializzazione completa del messaggio con i valori modificati
+    expected, header = copy.deepcopy(VALUE), {}
+    for path, new in values.items():
+        *parents, last = path.split(".")
+        target = header if parents == ["header"] else expected
+        if target is expected:
+            for part in parents:
+                target = target[part]
+        target[last] = new
+    message = message_type.from_dict(expected)
+    if header:
+        message.header = type(message.header).from_dict({**message.header.to_dict(), **header})
+    return message.serialize()
+
+
+@pytest.mark.parametrize("path", list(PATCHES))
+def test_set_changes_only_the_field(message_type, path):
+    frame = message_type.from_dict(VALUE).serialize()
+    original = bytes(frame)
+    field = message_type.field(path)
+    start = field.offset_in(frame)
+    end = start + field.codec.size
+
+    field.set(frame, PATCHES[path])
+    # Tutti i byte fuori dal campo restano invariati, e il risultato è quello di una serializzazione completa
+    assert frame[:start] == original[:start] and frame[end:] == original[end:]
+    assert frame == expected_frame(message_type, {path: PATCHES[path]})
+
+
+def test_patch_at_offset(message_type):
+    frame = message_type.from_dict(VALUE).serialize()
+    padded = bytearray(b"\xaa" * 5) + frame + bytearray(b"\xbb" * 5)
+    values = {"header.seq": 9, "var.last.a": 42, "after.inner.status": "WARNING", "tail": 1}
+    message_type.patch(padded, values, offset=5)
+    assert padded == b"\xaa" * 5 + expected_frame(message_type, values) + b"\xbb" * 5
+    assert message_type.field("var.last.a").get(padded, 5) == 42
+
+
+@pytest.mark.parametrize("path, message", [
+    ("points", "dimensione variabile"),
+    ("var", "dimensione variabile"),
+    ("var.points", "dimensione variabile"),
+    ("points.x", "non è un composite"),
+    ("var.points.x", "non è un composite"),
+    ("outer.missing", "non presente"),
+])
+def test_reject_variable_paths(message_type, path, message):
+    frame = message_type.from_dict(VALUE).serialize()
+    original = bytes(frame)
+    with pytest.raises(ValueError, match=message):
+        message_type.patch(frame, {path: 1})
+    assert frame == original
@@ -0,0 +1,63 @@
+import copy
+import random
+
+import pytest
+import yaml
+
+from rip.core import RISParser, RParallelDecoder
+from rip.core.rserializable import RSerializable
+from rip.benchmarks.schemas import build_schema, sample_value
+
+
+def test_decode_file_with_other_byte_order(tmp_path):
+    little = build_schema(list_size=3, depth=2, width=10, enums=2, enum_values=3, numpy_lists=False)
+    rng = random.Random(3)
+    parser = RISParser()
+    parser.load_schema(little)
+    classes, _ = parser.generate_classes()
+    value = sample_value(little, "SensorBatch", rng, 3)
+    reference = classes.SensorBatch.from_dict(value).serialize()
+
+    big = copy.deepcopy(little)
+    big["metadata"]["byte_order"] = ">"
+    schema = tmp_path / "big.yaml"
+    schema.write_text(yaml.safe_dump(big))
+    big_classes, _ = RISParser(str(schema)).generate_classes()
+    frames = [bytes(big_classes.SensorMessage.from_dict(sample_value(big, "SensorMessage", rng, 3)).serialize())
+              for _ in range(200)]
+    capture = tmp_path / "capture.bin"
+    capture.write_bytes(b"".join(frames))
+    expected = [big_classes.SensorMessage.deserialize(frame).to_dict() for frame in frames]
+
+    with RParallelDecoder(str(schema), workers=2, chunk_size=1024) as decoder:
+        assert list(decoder.decode_file(str(capture))) == expected
+        assert [message.to_dict() for message in decoder.decode_file(str(capture), output="object")] == expected
+
+    # Il decoder non cambia le classi già caricate nel processo chiamante
+    assert classes.SensorBatch.from_dict(value).serialize() == reference
+    assert RSerializable.byte_order == "<"
+
+
+def test_columns_reject_variable_layout_up_front(tmp_path):
+    schema_dict = build_schema(list_size=3, depth=2, width=10, enums=2, enum_values=3, numpy_lists=False)
+    schema = tmp_path / "schema.yaml"
+    schema.write_text(yaml.safe_dump(schema_dict))
+    classes, _ = RISParser(str(schema)).generate_classes()
+    rng = random.Random(4)
+    # Molti messaggi a layout fisso prima dell'unico a layout variabile
+    frames = [bytes(classes.WideMessage.from_dict(sample_value(schema_dict, "WideMessage", rng, 3)).serialize())
+              for _ in range(300)]
+    frames.append(bytes(classes.SensorMessage.from_dict(sample_value(schema_dict, "SensorMessage", rng, 3)).serialize()))
+    capture = tmp_path / "capture.bin"
+    capture.write_bytes(b"".join(frames))
+
+    with RParallelDecoder(str(schema), workers=2, chunk_size=1024) as decoder:
+        shards = decoder.decode_file(str(capture), output="columns")
+        with pytest.raises(ValueError, match="SensorMessage"):
+            next(shards)
+        assert decoder._pool is None
+
+    fixed = tmp_path / "fixed.bin"
+    fixed.write_bytes(b"".join(frames[:-1]))
+    with RParallelDecoder(str(schema), workers=2, chunk_size=1024) as decoder:
+        assert sum(len(shard["WideMessage"]) for shard in decoder.decode_file(str(fixed), output="columns")) == 300
@@ -0,0 +1,30 @@
+import pickle
+
+import pytest
+
+from rip.core import RInt, RInt16, RUint32, RFloat64, RString, RString8
+from rip.core.rfloat import RFloat
+
+
+def test_deprecated_size_arguments():
+    with pytest.deprecated_call():
+        value = RInt(5, size=4, signed=True)
+    assert type(value) is RInt and value == 5 and value.serialize() == RInt(5).serialize()
+    with pytest.deprecated_call():
+        assert RFloat(0.5, 4) == 0.5
+    with pytest.deprecated_call():
+        assert RString("abc", size=32) == "abc"
+    # Valori diversi da quelli della classe: la dimensione non è più per istanza
+    for make in (lambda: RInt(5, size=2), lambda: RInt(5, signed=False), lambda: RFloat(0.5, size=8),
+                 lambda: RString("abc", 8)):
+        with pytest.deprecated_call(), pytest.raises(ValueError, match="non valido"):
+            make()
+
+
+def test_fixed_size_classes_take_only_the_value():
+    assert RInt16(-3).serialize() == (-3).to_bytes(2, "little", signed=True)
+    assert RUint32() == 0 and RFloat64() == 0.0 and RString8("abcdefghij") == "abcdefgh"
+    with pytest.raises(TypeError):
+        RInt16(5, 2)
+    for value in (RInt16(-3), RUint32(7), RFloat64(0.25), RString8("ab")):
+        assert pickle.loads(pickle.dumps(value)) == value and type(pickle.loads(pickle.dumps(value))) is type(value)
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from rip.core import RISParser
+from rip.benchmarks.schemas import build_schema, sample_value
+
+
+def paths(schema, type_name, prefix=""):
+    # Tutti i percorsi dei campi (composite annidati compresi) di una struttura
+    struct_def = schema["composites"].get(type_name) or schema["messages"].get(type_name)
+    if struct_def is None:
+        return []
+    result = []
+    for field, field_type in struct_def["fields"].items():
+        result.append(prefix + field)
+        result += paths(schema, field_type, prefix + field + ".")
+    return result
+
+
+def lookup(value, path):
+    for part in path.split("."):
+        value = value[part]
+    return value
+
+
+@pytest.mark.parametrize("unboxed", [False, True])
+@pytest.mark.parametrize("specialized", [False, True])
+def test_project_to_dict_matches_to_dict(specialized, unboxed):
+    schema = build_schema(list_size=3, depth=3, width=12, enums=3, enum_values=4)
+    if unboxed:
+        for struct_def in [*schema["composites"].values(), *schema["messages"].values()]:
+            struct_def["unboxed"] = True
+    parser = RISParser()
+    parser.load_schema(schema)
+    classes, _ = parser.generate_classes(specialized)
+    rng = random.Random(21)
+    for name in schema["messages"]:
+        message_type = getattr(classes, name)
+        frame = message_type.from_dict(sample_value(schema, name, rng, 3)).serialize()
+        expected = message_type.deserialize(frame).to_dict()
+        selected = paths(schema, name)
+        projected = message_type.project(frame, selected, to_dict=True)
+        assert projected == {path: lookup(expected, path) for path in selected}
+        # Ogni campo anche da solo: percorsi diversi, stesso risultato
+        for path in selected:
+            assert message_type.project(frame, [path], to_dict=True) == {path: lookup(expected, path)}
+        header = message_type.project(frame, ["header.id", "header.length"], to_dict=True)
+        assert header == {"header.id": message_type.id, "header.length": len(frame)}
+
+
+def test_project_unboxed_enum():
+    schema = build_schema(list_size=3, depth=2, width=10, enums=2, enum_values=3)
+    schema["composites"]["SensorData"]["unboxed"] = True
+    parser = RISParser()
+    parser.load_schema(schema)
+    classes, _ = parser.generate_classes()
+    value = sample_value(schema, "SensorMessage", random.Random(2), 3)
+    value["sensor"]["status"] = "WARNING"
+    frame = classes.SensorMessage.from_dict(value).serialize()
+    assert classes.SensorMessage.project(frame, ["sensor.status"], to_dict=True) == {"sensor.status": "WARNING"}
+    assert classes.SensorMessage.project(frame, ["sensor.status"]) == {"sensor.status": 1}
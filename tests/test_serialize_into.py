@@ -0,0 +1,38 @@
+import struct
+
+import numpy as np
+import pytest
+
+from rip.core import RISParser
+from rip.benchmarks.schemas import build_schema
+
+
+@pytest.fixture(scope="module")
+def classes():
+    parser = RISParser()
+    parser.load_schema(build_schema(list_size=4, depth=2, width=10, enums=2, enum_values=3))
+    return parser.generate_classes()[0]
+
+
+def test_array_backed_list_does_not_grow_buffer(classes):
+    wave = classes.Wave(np.arange(4, dtype=np.float32))
+    for size, offset in ((4, 2), (16, 1), (8, 20)):
+        buffer = bytearray(size)
+        with pytest.raises(struct.error):
+            wave.serialize_into(buffer, offset)
+        assert len(buffer) == size
+    buffer = bytearray(18)
+    assert wave.serialize_into(buffer, 2) == 18
+    assert bytes(buffer[2:]) == wave.serialize()
+
+
+def test_view_does_not_grow_buffer(classes):
+    frame = classes.WaveMessage.from_dict({"n": 4, "samples": [1.0, 2.0, 3.0, 4.0]}).serialize()
+    view = classes.WaveMessage.view(frame)
+    buffer = bytearray(len(frame) - 1)
+    with pytest.raises(struct.error):
+        view.serialize_into(buffer)
+    assert len(buffer) == len(frame) - 1
+    buffer = bytearray(len(frame) + 3)
+    assert view.serialize_into(buffer, 3) == len(buffer)
+    assert bytes(buffer[3:]) == frame
@@ -0,0 +1,98 @@
+import random
+
+import numpy as np
+import pytest
+
+from rip.core import RISParser
+from rip.benchmarks.schemas import build_schema, sample_value
+
+# Uno schema con ogni costrutto: composite (anche unboxed e annidati), enum di varie dimensioni,
+# liste a lunghezza fissa/variabile di primitivi, stringhe, enum e composite, liste array_backed, union
+CONSTRUCTS = {
+    "composites": {
+        "Header": {"fields": {"id": "uint16", "length": "uint32", "source": "uint8", "dest": "uint8", "seq": "uint32"}},
+        "Point": {"fields": {"x": "float64", "y": "float32", "tag": "string8", "on": "bool"}},
+        "UPoint": {"unboxed": True, "fields": {"x": "int16", "status": "Status", "name": "string16", "p": "Point"}},
+        "Mixed": {"fields": {"n": "uint16", "items": "PointList", "fixed": "Fixed3", "codes": "Codes4",
+                             "names": "Names2", "points": "Points2", "choice": "Choice"}},
+        "UMixed": {"unboxed": True, "fields": {"count": "uint8", "values": "Floats", "status": "Status",
+                                               "inner": "UPoint", "small": "Small"}},
+    },
+    "enums": {
+        "Status": {"values": {"OK": 0, "WARNING": 1, "ERROR": 2}, "size_in_bytes": 4},
+        "Small": {"values": {"A": 1, "B": 5, "C": 200}, "size_in_bytes": 1},
+    },
+    "arrays": {
+        "PointList": {"element_type": "Point", "length_field": "n"},
+        "Floats": {"element_type": "float32", "length_field": "count"},
+        "Fixed3": {"element_type": "int32", "length_field": 3},
+        "Codes4": {"element_type": "Status", "length_field": 4},
+        "Names2": {"element_type": "string8", "length_field": 2},
+        "Points2": {"element_type": "Point", "length_field": 2},
+        "Wave": {"element_type": "float32", "length_field": "n", "array_backed": True},
+        "FixedWave": {"element_type": "int16", "length_field": 8, "array_backed": True},
+        "SmallCodes": {"element_type": "Small", "length_field": 3, "array_backed": True},
+    },
+    "unions": {
+        "Choice": {"possible_types": {"i": "int32", "s": "string16", "p": "Point", "e": "Small", "f": "Fixed3"}},
+    },
+    "messages": {
+        "AllFixed": {"fields": {"p": "Point", "fixed": "Fixed3", "codes": "Codes4", "small": "Small",
+                                "wave": "FixedWave", "smalls": "SmallCodes", "names": "Names2"}},
+        "Variable": {"fields": {"mixed": "Mixed", "umixed": "UMixed", "u": "UPoint"}},
+        "UnboxedMessage": {"unboxed": True, "fields": {"a": "int8", "b": "uint64", "status": "Status",
+                                                       "p": "Point", "choice": "Choice", "d": "double"}},
+        "WaveMessage": {"fields": {"n": "uint32", "wave": "Wave", "tail": "int64"}},
+    },
+}
+for message_id, message in enumerate(CONSTRUCTS["messages"].values(), start=10):
+    message.update(id=message_id, source=3, dest=4)
+
+SCHEMAS = {
+    "constructs": CONSTRUCTS,
+    "benchmark": build_schema(list_size=4, depth=3, width=30, enums=3, enum_values=5),
+}
+
+
+def load(schema, byte_order, specialized):
+    parser = RISParser()
+    parser.load_schema(dict(schema, metadata={"byte_order": byte_order, "enum_size_in_bytes": 4,
+                                              "list_length_field_size": 4}))
+    return parser.generate_classes(specialized)[0]
+
+
+@pytest.mark.parametrize("byte_order", ["<", ">"])
+@pytest.mark.parametrize("schema_name", list(SCHEMAS))
+def test_specialized_matches_generic(schema_name, byte_order):
+    schema = SCHEMAS[schema_name]
+    generic, specialized = load(schema, byte_order, False), load(schema, byte_order, True)
+    rng = random.Random(42)
+    for name in schema["messages"]:
+        generic_type, specialized_type = getattr(generic, name), getattr(specialized, name)
+        for size in (0, 1, 5):
+            value = sample_value(schema, name, rng, size)
+            frame = generic_type.from_dict(value).serialize()
+            assert specialized_type.from_dict(value).serialize() == frame, name
+            assert specialized_type.from_dict(value).size_in_bytes() == generic_type.from_dict(value).size_in_bytes()
+
+            expected = generic_type.deserialize(frame)
+            decoded = specialized_type.deserialize(frame)
+            assert decoded.to_dict() == expected.to_dict(), name
+            assert decoded.serialize() == frame, name
+            for field in generic_type.__annotations__:
+                assert type(getattr(decoded, field)).__name__ == type(getattr(expected, field)).__name__, (name, field)
+            # Anche il parsing parte da un offset diverso da zero
+            padded = bytes(3) + bytes(frame)
+            assert specialized_type.deserialize_from(padded, 3)[1] == len(padded)
+            assert generic_type.deserialize_from(padded, 3)[1] == len(padded)
+
+
+@pytest.mark.parametrize("byte_order", ["<", ">"])
+def test_specialized_array_backed_stays_numpy(byte_order):
+    classes = load(CONSTRUCTS, byte_order, True)
+    value = sample_value(CONSTRUCTS, "WaveMessage", random.Random(1), 6)
+    decoded = classes.WaveMessage.deserialize(classes.WaveMessage.from_dict(value).serialize())
+    assert isinstance(decoded.wave.items, np.ndarray)
+    decoded = classes.AllFixed.deserialize(
+        classes.AllFixed.from_dict(sample_value(CONSTRUCTS, "AllFixed", random.Random(2), 0)).serialize())
+    assert isinstance(decoded.wave.items, np.ndarray) and isinstance(decoded.smalls.items, np.ndarray)
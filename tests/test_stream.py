@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from rip.core import RISParser, RStreamDecoder, RHeaderReader, RView
+from rip.benchmarks.schemas import build_schema, sample_value
+
+SCHEMA = build_schema(list_size=4, depth=2, width=10, enums=2, enum_values=3)
+
+
+@pytest.fixture(scope="module")
+def parsed():
+    parser = RISParser()
+    parser.load_schema(SCHEMA)
+    return parser.generate_classes()
+
+
+def make_frames(classes, count, seed):
+    # Messaggi di tipi e lunghezze diverse, come in una cattura reale
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(count):
+        name = rng.choice(list(SCHEMA["messages"]))
+        value = sample_value(SCHEMA, name, rng, rng.randint(0, 6))
+        frames.append(bytes(getattr(classes, name).from_dict(value).serialize()))
+    return frames
+
+
+def expected_dicts(message_map, frames):
+    return [message_map[int.from_bytes(frame[0:2], "little")].deserialize(frame).to_dict() for frame in frames]
+
+
+def chunked(data, rng, header_size):
+    # Chunk casuali: da 1 byte (header spezzato) a più frame interi in un colpo solo
+    position = 0
+    while position < len(data):
+        size = rng.choice([1, header_size - 1, header_size + 1, rng.randint(1, 64), rng.randint(64, 4096)])
+        yield data[position:position + size]
+        position += size
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_random_chunks(parsed, seed, lazy):
+    classes, message_map = parsed
+    frames = make_frames(classes, 150, seed)
+    expected = expected_dicts(message_map, frames)
+    decoder = RStreamDecoder(message_map, lazy=lazy)
+    messages = []
+    for chunk in chunked(b"".join(frames), random.Random(seed), decoder.header.size):
+        messages += decoder.feed(chunk)
+    assert decoder.pending == 0
+    # Le view restano valide anche dopo che il buffer del decoder è stato compattato
+    assert all(isinstance(message, RView) == lazy for message in messages)
+    assert [message.to_dict() for message in messages] == expected
+
+
+def test_header_split_and_many_frames_per_chunk(parsed):
+    classes, message_map = parsed
+    frames = make_frames(classes, 20, 7)
+    expected = expected_dicts(message_map, frames)
+    decoder = RStreamDecoder(message_map)
+    data = b"".join(frames)
+    # Un chunk con metà header del primo frame, poi tutto il resto in un solo chunk
+    assert list(decoder.feed(data[:5])) == []
+    assert decoder.pending == 5
+    assert [message.to_dict() for message in decoder.feed(data[5:])] == expected
+    # Byte per byte
+    decoder.reset()
+    assert [message.to_dict() for byte in data for message in decoder.feed(bytes([byte]))] == expected
+
+
+def test_truncated_final_frame(parsed):
+    classes, message_map = parsed
+    frames = make_frames(classes, 10, 8)
+    expected = expected_dicts(message_map, frames)
+    decoder = RStreamDecoder(message_map)
+    data = b"".join(frames)
+    messages = list(decoder.feed(data[:-3]))
+    assert [message.to_dict() for message in messages] == expected[:-1]
+    assert decoder.pending == len(frames[-1]) - 3
+    assert [message.to_dict() for message in decoder.feed(data[-3:])] == expected[-1:]
+    assert decoder.pending == 0
+
+
+def test_unknown_message_id(parsed):
+    classes, message_map = parsed
+    frames = make_frames(classes, 3, 9)
+    unknown = bytearray(frames[1])
+    unknown[0:2] = (999).to_bytes(2, "little")
+    decoder = RStreamDecoder(message_map)
+    messages = decoder.feed(frames[0] + bytes(unknown) + frames[2])
+    assert next(messages).to_dict() == expected_dicts(message_map, frames[:1])[0]
+    with pytest.raises(KeyError, match="999"):
+        next(messages)
+
+
+def test_invalid_frame_length(parsed):
+    classes, message_map = parsed
+    frame = bytearray(make_frames(classes, 1, 10)[0])
+    frame[2:6] = (3).to_bytes(4, "little")  # Header.length più corta dell'header
+    with pytest.raises(ValueError, match="non valida"):
+        list(RStreamDecoder(message_map).feed(frame))
+
+
+def test_header_reader(parsed):
+    classes, _ = parsed
+    header = classes.Header.from_dict({"id": 101, "length": 70000, "source": 1, "dest": 2, "seq": 123456})
+    data = bytes(4) + bytes(header.serialize())
+    reader = RHeaderReader(classes.Header, fields=("seq", "id", "dest"))
+    assert reader.size == 12
+    assert reader.peek(data, 4) == (123456, 101, 2)
+    assert RHeaderReader(classes.Header).peek(data, 4) == (101, 70000)
+
+
+def test_header_reader_rejects_variable_layout():
+    parser = RISParser()
+    parser.load_schema({
+        "composites": {"VarHeader": {"fields": {"n": "uint8", "route": "Route", "id": "uint16", "length": "uint32"}}},
+        "arrays": {"Route": {"element_type": "uint8", "length_field": "n"}},
+    })
+    classes, _ = parser.generate_classes()
+    with pytest.raises(ValueError, match="layout fisso"):
+        RHeaderReader(classes.VarHeader)
@@ -0,0 +1,75 @@
+import random
+import sys
+import threading
+
+import pytest
+
+from rip.core import RISParser, RHeaderReader, serialize_many, deserialize_many
+from rip.benchmarks.schemas import build_schema, sample_value
+
+THREADS = 8
+ITERATIONS = 300
+
+
+@pytest.fixture
+def switch_interval():
+    # Intervallo di switch minimo: più interleaving tra i thread anche con il GIL
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def load(specialized):
+    schema = build_schema(list_size=20, depth=3, width=10, enums=2, enum_values=3, numpy_lists=False)
+    parser = RISParser()
+    parser.load_schema(schema)
+    classes, message_map = parser.generate_classes(specialized)
+    return schema, classes, message_map
+
+
+@pytest.mark.parametrize("specialized", [False, True])
+def test_concurrent_serialize(specialized, switch_interval):
+    schema, classes, _ = load(specialized)
+    template = classes.SensorBatch.header.to_dict()
+    header = RHeaderReader(classes.Header)
+    rng = random.Random(11)
+    # Liste di lunghezza diversa: header.length cambia da un messaggio all'altro
+    messages = [classes.SensorBatch.from_dict(sample_value(schema, "SensorBatch", rng, size)) for size in range(THREADS)]
+    expected = [bytes(message.serialize()) for message in messages]
+    decoded = [classes.SensorBatch.deserialize(frame).to_dict() for frame in expected]
+    errors, barrier = [], threading.Barrier(THREADS)
+
+    def hammer(index):
+        barrier.wait()
+        for _ in range(ITERATIONS):
+            frame = messages[index].serialize()
+            if frame != expected[index] or header.peek(frame) != (classes.SensorBatch.id, len(frame)):
+                errors.append(f"thread {index}: frame {bytes(frame).hex()}")
+                return
+            if classes.SensorBatch.deserialize(frame).to_dict() != decoded[index]:
+                errors.append(f"thread {index}: round trip mismatch")
+                return
+
+    threads = [threading.Thread(target=hammer, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert classes.SensorBatch.header.to_dict() == template
+
+
+@pytest.mark.parametrize("specialized", [False, True])
+def test_serialize_many(specialized):
+    schema, classes, message_map = load(specialized)
+    rng = random.Random(13)
+    messages = [classes.SensorBatch.from_dict(sample_value(schema, "SensorBatch", rng, rng.randint(0, 20)))
+                for _ in range(1000)]
+    expected = [message.serialize() for message in messages]
+    decoded = [classes.SensorBatch.deserialize(frame).to_dict() for frame in expected]
+    for workers in (1, 4):
+        frames = serialize_many(messages, workers=workers, chunk_size=64)
+        assert frames == expected
+        for types in (message_map, classes.SensorBatch):
+            assert [message.to_dict() for message in deserialize_many(frames, types, workers=workers, chunk_size=64)] == decoded
@@ -0,0 +1,79 @@
+import importlib
+import json
+import random
+import sys
+
+import pytest
+
+from rip.core import RISParser, RTranscoder
+from rip.benchmarks.schemas import build_schema, sample_value
+
+SCHEMA = build_schema(list_size=4, depth=3, width=30, enums=3, enum_values=5)
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["generic", "specialized"])
+def classes(request):
+    parser = RISParser()
+    parser.load_schema(SCHEMA)
+    return parser.generate_classes(request.param)[0]
+
+
+@pytest.mark.parametrize("name", list(SCHEMA["messages"]))
+def test_transcoder_matches_classes(classes, name):
+    # SensorMessage: union; SensorBatch: lista variabile di composite; DeepMessage: composite annidati;
+    # EnumMessage: simboli enum; WaveMessage: lista array_backed
+    message_type = getattr(classes, name)
+    transcoder = RTranscoder.of(message_type)
+    rng = random.Random(name)
+    for size in (0, 1, 4):
+        value = sample_value(SCHEMA, name, rng, size)
+        frame = message_type.from_dict(value).serialize()
+        assert transcoder.encode(value) == frame
+        expected = message_type.deserialize(frame).to_dict()
+        assert transcoder.decode(frame) == expected
+        assert transcoder.decode_from(bytes(5) + bytes(frame), 5) == (expected, 5 + len(frame))
+        assert transcoder.from_json(transcoder.to_json(frame)) == frame
+        assert json.loads(transcoder.to_json(frame)) == json.loads(json.dumps(expected))
+
+
+def test_transcoder_value_shapes(classes):
+    rng = random.Random(3)
+    value = sample_value(SCHEMA, "SensorMessage", rng, 0)
+    value["sensor"]["status"] = "ERROR"
+    value["measure"] = {"int_value": -12}
+    decoded = RTranscoder.of(classes.SensorMessage).decode(classes.SensorMessage.from_dict(value).serialize())
+    assert decoded["sensor"]["status"] == "ERROR"
+    assert decoded["measure"] == {"int_value": -12}
+    wave = {"n": 3, "samples": [0.5, -1.0, 2.0]}
+    assert RTranscoder.of(classes.WaveMessage).decode(classes.WaveMessage.from_dict(wave).serialize()) == wave
+
+
+def test_transcoder_errors_match_classes(classes):
+    value = sample_value(SCHEMA, "SensorMessage", random.Random(4), 0)
+    transcoder = RTranscoder.of(classes.SensorMessage)
+    for bad in ({**value, "measure": {"nope": 1}}, {**value, "sensor": {**value["sensor"], "status": "NOPE"}}):
+        with pytest.raises(ValueError) as expected:
+            classes.SensorMessage.from_dict(bad).serialize()
+        with pytest.raises(ValueError) as error:
+            transcoder.encode(bad)
+        assert str(error.value) == str(expected.value)
+
+
+def test_dispatch_unknown_message_id(tmp_path, monkeypatch):
+    parser = RISParser()
+    parser.load_schema(SCHEMA)
+    parser.generate_code(str(tmp_path / "ristest_dispatch"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = importlib.import_module("ristest_dispatch")
+    try:
+        frame = package.SensorMessage.from_dict(sample_value(SCHEMA, "SensorMessage", random.Random(5), 0)).serialize()
+        assert package.deserialize(frame, to_dict=True) == package.deserialize(frame).to_dict()
+        frame[0:2] = (999).to_bytes(2, "little")  # Header.id sconosciuto
+        for to_dict in (False, True):
+            with pytest.raises(KeyError):
+                package.deserialize(frame, to_dict=to_dict)
+            with pytest.raises(KeyError):
+                list(package.deserialize_frames(frame, to_dict=to_dict))
+    finally:
+        for module in [module for module in sys.modules if module.startswith("ristest_dispatch")]:
+            del sys.modules[module]